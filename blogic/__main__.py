@@ -0,0 +1,7 @@
+# Allows running the command line tool with python -m blogic
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
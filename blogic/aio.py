@@ -0,0 +1,65 @@
+# This file is used to evaluate truth tables from asyncio code without blocking the event loop.
+
+from .evaluator import *
+
+import asyncio
+
+# The number of rows that are evaluated before giving control back to the event loop
+DEFAULT_CHUNK_SIZE = 1024
+
+async def aiter_chunks(postfix_tokens : list, variables : list, chunk_size : int = DEFAULT_CHUNK_SIZE, executor = None):
+    """Yields the rows of the truth table in chunks, giving control back to the event loop between them
+
+    If an executor is given, each chunk is evaluated in it rather than on the event loop."""
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    loop = asyncio.get_running_loop()
+
+    num_rows = 2 ** len(variables)
+
+    # Compile once for every chunk
+    program = compile_range(postfix_tokens, variables)
+
+    # Iterate over the chunks
+    for start in range(0, num_rows, chunk_size):
+        stop = min(start + chunk_size, num_rows)
+
+        if executor is None:
+            # Evaluate on the loop
+            rows = evaluate_range(program, variables, start, stop)
+
+            # Let the other tasks run
+            await asyncio.sleep(0)
+        else:
+            # Evaluate in the executor (the loop is free while it runs)
+            rows = await loop.run_in_executor(executor, evaluate_range, program, variables, start, stop)
+
+        yield rows
+
+async def aiter_truth_table(expressions : str, sort_vars : bool = False, chunk_size : int = DEFAULT_CHUNK_SIZE, executor = None):
+    """Yields the rows of the truth table for the expressions one at a time"""
+
+    # Get the program
+    postfix_tokens, variables = parse(expressions, sort_vars)
+
+    # Yield the rows chunk by chunk
+    async for chunk in aiter_chunks(postfix_tokens, variables, chunk_size, executor):
+        for row in chunk:
+            yield row
+
+async def evaluate_all_async(expressions : str, sort_vars : bool = False, chunk_size : int = DEFAULT_CHUNK_SIZE, executor = None) -> list:
+    """Generates a truth table for the expressions"""
+
+    # Get the program
+    postfix_tokens, variables = parse(expressions, sort_vars)
+
+    # Truth table
+    truth_table = []
+
+    # Add the chunks as they are finished
+    async for chunk in aiter_chunks(postfix_tokens, variables, chunk_size, executor):
+        truth_table.extend(chunk)
+
+    return truth_table
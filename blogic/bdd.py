@@ -0,0 +1,309 @@
+# This file is used to build reduced ordered binary decision diagrams (BDDs).
+#
+# A BDD stores a boolean function as a graph of nodes, each testing one variable and pointing to the node
+# to use when it is false (low) and when it is true (high). With a fixed variable order and no duplicate or
+# redundant nodes, every function has exactly one BDD, which makes them handy for comparing functions.
+
+from .tokens import *
+
+# The node ids of the terminals
+FALSE = 0
+TRUE = 1
+
+class BDD:
+    """A set of BDD nodes over an ordered list of variables"""
+
+    def __init__(self, variables : list):
+        self.variables = list(variables)
+
+        # Nodes are (level, low, high) tuples, the level being the index of the tested variable.
+        # The terminals are below every variable.
+        terminal_level = len(self.variables)
+        self.nodes = [(terminal_level, FALSE, FALSE), (terminal_level, TRUE, TRUE)]
+
+        self._unique = {} # Maps (level, low, high) to the node id (this keeps the nodes unique)
+
+    def node(self, level : int, low : int, high : int) -> int:
+        """Gets the id of the node testing the variable at level"""
+
+        # Redundant test, both branches are the same
+        if low == high:
+            return low
+
+        key = (level, low, high)
+
+        if key not in self._unique:
+            self._unique[key] = len(self.nodes)
+            self.nodes.append(key)
+
+        return self._unique[key]
+
+    def variable(self, name : str) -> int:
+        """Gets the node for a single variable"""
+
+        return self.node(self.variables.index(name), FALSE, TRUE)
+
+    def _bottom_up(self, u : int, leaf, combine):
+        """Works out a result for u from the results of its children, children first (using a stack rather than
+        recursion, the BDD can have thousands of levels)
+
+        leaf(v) gives the result for nodes that don't need their children (or None), combine(v, low, high) gives
+        it from the results of the children."""
+
+        memo = {}
+        stack = [u]
+
+        while stack:
+            v = stack[-1]
+
+            if v in memo:
+                stack.pop()
+                continue
+
+            result = leaf(v)
+
+            if result is not None:
+                memo[v] = result
+                stack.pop()
+                continue
+
+            _, low, high = self.nodes[v]
+
+            # Work out the children first
+            if low not in memo or high not in memo:
+                if low not in memo:
+                    stack.append(low)
+
+                if high not in memo:
+                    stack.append(high)
+
+                continue
+
+            stack.pop()
+            memo[v] = combine(v, memo[low], memo[high])
+
+        return memo[u]
+
+    def negate(self, u : int) -> int:
+        """Gets the node for NOT u"""
+
+        return self._bottom_up(
+            u,
+            lambda v: {FALSE: TRUE, TRUE: FALSE}.get(v),
+            lambda v, low, high: self.node(self.nodes[v][0], low, high)
+        )
+
+    def _apply_terminal(self, operator : Operator, u : int, v : int) -> int:
+        """Gets the node for the operator performed on u and v, where at least one of them is a terminal"""
+
+        if u <= TRUE:
+            if_false = operator.perform(u == TRUE, False)
+            if_true = operator.perform(u == TRUE, True)
+            other = v
+        else:
+            if_false = operator.perform(False, v == TRUE)
+            if_true = operator.perform(True, v == TRUE)
+            other = u
+
+        if if_false == if_true:
+            return TRUE if if_true else FALSE
+
+        return other if if_true else self.negate(other)
+
+    def apply(self, operator : Operator, u : int, v : int) -> int:
+        """Gets the node for the operator performed on u and v"""
+
+        memo = {}
+        stack = [(u, v)]
+
+        while stack:
+            key = stack[-1]
+
+            if key in memo:
+                stack.pop()
+                continue
+
+            u, v = key
+
+            # One of them is a terminal, so the result is a terminal, the other node or its negation
+            if u <= TRUE or v <= TRUE:
+                memo[key] = self._apply_terminal(operator, u, v)
+                stack.pop()
+                continue
+
+            u_level, u_low, u_high = self.nodes[u]
+            v_level, v_low, v_high = self.nodes[v]
+
+            # Split on the variable that comes first
+            level = min(u_level, v_level)
+
+            if u_level != level:
+                u_low = u_high = u
+
+            if v_level != level:
+                v_low = v_high = v
+
+            low = (u_low, v_low)
+            high = (u_high, v_high)
+
+            # Work out both branches first
+            if low not in memo or high not in memo:
+                if low not in memo:
+                    stack.append(low)
+
+                if high not in memo:
+                    stack.append(high)
+
+                continue
+
+            stack.pop()
+            memo[key] = self.node(level, memo[low], memo[high])
+
+        return memo[key]
+
+    def restrict(self, u : int, level : int, value : bool) -> int:
+        """Gets the node for u with the variable at level set to value"""
+
+        def leaf(v):
+            v_level, low, high = self.nodes[v]
+
+            # The variable can't be below this node (this includes the terminals)
+            if v_level > level:
+                return v
+
+            if v_level == level:
+                return high if value else low
+
+            return None
+
+        return self._bottom_up(u, leaf, lambda v, low, high: self.node(self.nodes[v][0], low, high))
+
+    def count(self, u : int) -> int:
+        """Gets the number of assignments of every variable that make u true"""
+
+        nodes = self.nodes
+
+        def combine(v, low_count, high_count):
+            # The number of assignments of the variables from the level of v down, variables skipped between
+            # this node and its children can have any value
+            level, low, high = nodes[v]
+            return low_count * 2 ** (nodes[low][0] - level - 1) + high_count * 2 ** (nodes[high][0] - level - 1)
+
+        total = self._bottom_up(u, lambda v: {FALSE: 0, TRUE: 1}.get(v), combine)
+
+        # The terminals are at the level below every variable
+        return total * 2 ** nodes[u][0]
+
+    def quantify(self, u : int, levels : set, operator : Operator) -> int:
+        """Combines the two cofactors of u for every variable in levels with the operator
+
+        Or gives the existential quantification (is there a value that makes u true) and And the universal one."""
+
+        def combine(v, low, high):
+            level = self.nodes[v][0]
+
+            # Remove the variable by combining both of its branches
+            if level in levels:
+                return self.apply(operator, low, high)
+
+            return self.node(level, low, high)
+
+        return self._bottom_up(u, lambda v: v if v <= TRUE else None, combine)
+
+    def from_postfix(self, postfix_tokens : list) -> int:
+        """Builds the node for the postfix tokens, returns None if there is no result (i.e. there are no tokens)"""
+
+        stack = [] # The stack
+
+        # Iterate over the tokens
+        for token in postfix_tokens:
+            # Handle variable tokens
+            if isinstance(token, Variable):
+                stack.append(self.variable(token.name))
+                continue
+
+            # Handle not
+            if isinstance(token, Not):
+                stack.append(self.negate(stack.pop()))
+                continue
+
+            # Handle flattened chains (one value at a time)
+            if isinstance(token, Nary):
+                args = stack[-token.count:]
+                del stack[-token.count:]
+
+                # Fold from the right, this way each value is usually joined above the result so far rather than
+                # walking all of it (the operators are associative and commutative, so the order doesn't matter)
+                result = args[-1]
+                for arg in reversed(args[:-1]):
+                    result = self.apply(token.operator, arg, result)
+
+                stack.append(result)
+                continue
+
+            # Handle operators
+            if isinstance(token, Operator):
+                arg2 = stack.pop()
+                arg1 = stack.pop()
+
+                stack.append(self.apply(token, arg1, arg2))
+                continue
+
+            # Failure
+            raise ValueError("Invalid token")
+
+        return stack.pop() if stack else None
+
+    def support(self, u : int) -> set:
+        """Gets the levels of the variables that u depends on"""
+
+        levels = set()
+        seen = {FALSE, TRUE}
+        stack = [u]
+
+        while stack:
+            v = stack.pop()
+
+            if v in seen:
+                continue
+
+            seen.add(v)
+
+            level, low, high = self.nodes[v]
+            levels.add(level)
+
+            stack.append(low)
+            stack.append(high)
+
+        return levels
+
+    def serialise(self, u : int) -> tuple:
+        """Gets the number of u and the nodes reachable from it as a list of (level, low, high) tuples
+
+        The terminals keep their ids and the other nodes are numbered by the order they are reached in,
+        so the same function always gives the same result."""
+
+        numbers = {FALSE: FALSE, TRUE: TRUE}
+        nodes = []
+
+        # Number the nodes children first (using a stack rather than recursion)
+        stack = [(u, False)]
+
+        while stack:
+            v, expanded = stack.pop()
+
+            if v in numbers:
+                continue
+
+            level, low, high = self.nodes[v]
+
+            if expanded:
+                numbers[v] = len(nodes) + 2
+                nodes.append((level, numbers[low], numbers[high]))
+                continue
+
+            stack.append((v, True))
+            stack.append((high, False))
+            stack.append((low, False))
+
+        return numbers[u], nodes
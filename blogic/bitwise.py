@@ -0,0 +1,220 @@
+# This file is used to evaluate many rows of a truth table at once.
+#
+# Each value is a Python int used as a bitmask, where bit j is the value for the j-th row of the block.
+# Operators are performed on the whole block at once using their perform_bits methods.
+
+from .tokens import *
+
+from functools import lru_cache
+
+# The number of rows evaluated at once (this must be a power of two)
+DEFAULT_BLOCK_SIZE = 2 ** 12
+
+# Patterns up to this size are cached (bigger ones would hold on to a lot of memory)
+MAX_CACHED_PATTERN_SIZE = 2 ** 16
+
+# Up to this many variables the analyses work on the whole truth table as a bitmask, beyond it they use the BDD
+MAX_BITMASK_VARIABLES = 20
+
+@lru_cache(maxsize=256)
+def _cached_pattern(shift : int, size : int) -> int:
+    return _pattern(shift, size)
+
+def _pattern(shift : int, size : int) -> int:
+    """Gets the bitmask of size rows where bit j is set if bit shift of j is set"""
+
+    period = 2 ** (shift + 1)
+
+    # A single period, the upper half of it is set
+    pattern = ((1 << (period // 2)) - 1) << (period // 2)
+
+    # Keep doubling it until it covers every row
+    while period < size:
+        pattern |= pattern << period
+        period *= 2
+
+    return pattern & ((1 << size) - 1)
+
+def variable_mask(index : int, num_variables : int, start : int = 0, size : int = None) -> int:
+    """Gets the bitmask of the rows from start to start + size where the variable at index is true
+
+    Just like evaluate_all, the first variable is the most significant bit of the row number.
+    The size must be a power of two and start must be a multiple of it."""
+
+    # Default to the whole table
+    if size is None:
+        size = 2 ** num_variables
+
+    if size & (size - 1) or start % size:
+        raise ValueError("Blocks must be a power of two in size and aligned to it")
+
+    # The bit of the row number that holds this variable
+    shift = num_variables - 1 - index
+
+    # The variable changes slower than the block, so it is the same for the whole block
+    if 2 ** shift >= size:
+        return (1 << size) - 1 if (start >> shift) & 1 else 0
+
+    if size <= MAX_CACHED_PATTERN_SIZE:
+        return _cached_pattern(shift, size)
+
+    return _pattern(shift, size)
+
+def flip_rows(bits : int, index : int, num_variables : int) -> int:
+    """Gets the bitmask of the rows where the variable at index is false and making it true changes the result
+
+    bits is the bitmask of the whole truth table (i.e. from evaluate_bits)."""
+
+    # The rows where the variable is true are this far after the matching rows where it is false
+    distance = 2 ** (num_variables - 1 - index)
+
+    # Line each row where it is false up with the matching row where it is true and compare them
+    false_rows = variable_mask(index, num_variables) ^ ((1 << 2 ** num_variables) - 1)
+
+    return ((bits >> distance) ^ bits) & false_rows
+
+def evaluate_masks(postfix_tokens : list, masks : dict, mask : int) -> int:
+    """Evaluates the postfix tokens with a bitmask for each variable, mask having a bit set for every row
+
+    Returns None if there is no result (i.e. there are no tokens)."""
+
+    stack = [] # The stack
+
+    # Iterate over the tokens
+    for token in postfix_tokens:
+        # Handle variable tokens
+        if isinstance(token, Variable):
+            stack.append(masks[token.name])
+            continue
+
+        # Handle not
+        if isinstance(token, Not):
+            stack.append(token.perform_bits(stack.pop(), mask))
+            continue
+
+        # Handle flattened chains
+        if isinstance(token, Nary):
+            args = stack[-token.count:]
+            del stack[-token.count:]
+
+            stack.append(token.perform_bits(args, mask))
+            continue
+
+        # Handle operators
+        if isinstance(token, Operator):
+            arg2 = stack.pop()
+            arg1 = stack.pop()
+
+            stack.append(token.perform_bits(arg1, arg2, mask))
+            continue
+
+        # Failure
+        raise ValueError("Invalid token")
+
+    # Return the result or None if there is no result
+    return stack.pop() if stack else None
+
+def evaluate_bits(postfix_tokens : list, variables : list, start : int = 0, size : int = None) -> int:
+    """Evaluates the postfix tokens for the rows from start to start + size, returns the bitmask of the true rows
+
+    Returns None if there is no result (i.e. there are no tokens)."""
+
+    num_variables = len(variables)
+
+    # Default to the whole table
+    if size is None:
+        size = 2 ** num_variables
+
+    # Get the values of the variables for the block
+    masks = {var: variable_mask(i, num_variables, start, size) for i, var in enumerate(variables)}
+
+    return evaluate_masks(postfix_tokens, masks, (1 << size) - 1)
+
+# Operators where the order of the arguments doesn't matter (used to share more subterms)
+COMMUTATIVE = (And, Or, Xor, IfAndOnlyIf)
+
+def compile_shared(postfix_lists : list) -> tuple:
+    """Compiles several postfix token lists into one program where identical subterms are only computed once
+
+    Returns a tuple of the nodes and the output node for each list (or None for empty lists). Nodes are
+    (token, argument node indexes) tuples in the order they need to be computed."""
+
+    nodes = []   # The program
+    ids = {}     # Maps a node's key to its index (so duplicates are removed)
+    outputs = [] # The node for each of the lists
+
+    def add(key, token, args):
+        # Reuse the existing node
+        if key in ids:
+            return ids[key]
+
+        ids[key] = len(nodes)
+        nodes.append((token, args))
+
+        return ids[key]
+
+    for postfix_tokens in postfix_lists:
+        stack = [] # Stack of node indexes
+
+        for token in postfix_tokens:
+            if isinstance(token, Variable):
+                stack.append(add(("var", token.name), token, ()))
+                continue
+
+            if isinstance(token, Not):
+                arg = stack.pop()
+                stack.append(add((Not, arg), token, (arg,)))
+                continue
+
+            if isinstance(token, Nary):
+                args = tuple(stack[-token.count:])
+                del stack[-token.count:]
+
+                # Every flattened operator is commutative
+                stack.append(add((Nary, type(token.operator), tuple(sorted(args))), token, args))
+                continue
+
+            if isinstance(token, Operator):
+                arg2 = stack.pop()
+                arg1 = stack.pop()
+
+                args = (arg1, arg2)
+
+                # Put the arguments in a standard order, this way 'A' AND 'B' and 'B' AND 'A' are shared
+                key_args = tuple(sorted(args)) if isinstance(token, COMMUTATIVE) else args
+
+                stack.append(add((type(token), key_args), token, args))
+                continue
+
+            raise ValueError("Invalid token")
+
+        outputs.append(stack.pop() if stack else None)
+
+    return nodes, outputs
+
+def evaluate_shared(nodes : list, outputs : list, variables : list, start : int = 0, size : int = None) -> list:
+    """Evaluates a program from compile_shared for the rows from start to start + size, returns a bitmask per output"""
+
+    num_variables = len(variables)
+
+    # Default to the whole table
+    if size is None:
+        size = 2 ** num_variables
+
+    mask = (1 << size) - 1 # Every row in the block
+    indexes = {var: i for i, var in enumerate(variables)}
+
+    values = [] # The value of each node
+
+    # Every node only depends on earlier ones
+    for token, args in nodes:
+        if isinstance(token, Variable):
+            values.append(variable_mask(indexes[token.name], num_variables, start, size))
+        elif isinstance(token, Not):
+            values.append(token.perform_bits(values[args[0]], mask))
+        elif isinstance(token, Nary):
+            values.append(token.perform_bits([values[arg] for arg in args], mask))
+        else:
+            values.append(token.perform_bits(values[args[0]], values[args[1]], mask))
+
+    return [None if output is None else values[output] for output in outputs]
@@ -0,0 +1,183 @@
+# This file is used to compile postfix tokens into compact bytecode.
+#
+# Rather than checking the type of every token and calling its perform method for every row, the tokens
+# are turned into integer opcodes once and run by a small interpreter loop with a preallocated stack.
+
+from .tokens import *
+
+from array import array
+
+# The opcodes
+LOAD = 0 # Push the variable at the operand index
+NOT = 1
+AND = 2
+OR = 3
+XOR = 4
+IFF = 5
+IMP = 6
+CONST = 7 # Push the operand as a boolean (only used by generated programs, there is no token for it)
+AND_N = 8 # The flattened operators take the operand number of values
+OR_N = 9
+XOR_N = 10
+
+# Maps the operator classes to their opcodes
+OPCODES = {
+    Not: NOT,
+    And: AND,
+    Or: OR,
+    Xor: XOR,
+    IfAndOnlyIf: IFF,
+    Implies: IMP
+}
+
+# Maps the operator classes of Nary tokens to their opcodes
+NARY_OPCODES = {
+    And: AND_N,
+    Or: OR_N,
+    Xor: XOR_N
+}
+
+class BaseProgram:
+    """Something that can be run with the values of its variables, subclasses set variables and implement run"""
+
+    variables = () # The variable names, in the order run takes their values
+
+    def run(self, values : list) -> bool:
+        """Runs the program with the values of the variables (in the same order as the variables)"""
+
+        raise NotImplementedError
+
+    def evaluate(self, variables : dict) -> bool:
+        """Runs the program with the values of the variables from a dict"""
+
+        return self.run([variables[var] for var in self.variables])
+
+    def evaluate_many(self, assignments : list) -> list:
+        """Runs the program once for each dict of values"""
+
+        run = self.run
+        names = self.variables
+
+        return [run([variables[var] for var in names]) for variables in assignments]
+
+class Program(BaseProgram):
+    """Bytecode for an expression, programs are never changed once compiled so they can be shared"""
+
+    def __init__(self, opcodes : array, operands : array, variables : tuple, stack_size : int):
+        self.opcodes = opcodes     # array('B') of opcodes
+        self.operands = operands   # array('I') of operands (the variable index for LOAD, otherwise 0)
+        self.variables = variables # The variable names, in the order the operands index them
+        self.stack_size = stack_size
+
+    def run(self, values : list) -> bool:
+        """Runs the program with the values of the variables (in the same order as the variables)
+
+        Returns None if there is no result (i.e. the program is empty)."""
+
+        stack = [None] * self.stack_size
+        sp = 0 # Points to the next free slot
+
+        for op, arg in zip(self.opcodes, self.operands):
+            if op == LOAD:
+                stack[sp] = values[arg]
+                sp += 1
+                continue
+
+            if op == NOT:
+                stack[sp - 1] = not stack[sp - 1]
+                continue
+
+            if op == CONST:
+                stack[sp] = arg == 1
+                sp += 1
+                continue
+
+            # Flattened operators replace the top arg values with their result
+            if op >= AND_N:
+                start = sp - arg
+
+                if op == AND_N:
+                    # Stops at the first false value
+                    result = all(stack[start:sp])
+                elif op == OR_N:
+                    # Stops at the first true value
+                    result = any(stack[start:sp])
+                else:
+                    # True if there are an odd number of true values
+                    result = sum(map(bool, stack[start:sp])) % 2 == 1
+
+                stack[start] = result
+                sp = start + 1
+                continue
+
+            # Binary operators replace the top two values with their result
+            sp -= 1
+            b = stack[sp]
+            a = stack[sp - 1]
+
+            if op == AND:
+                stack[sp - 1] = a and b
+            elif op == OR:
+                stack[sp - 1] = a or b
+            elif op == XOR:
+                stack[sp - 1] = a ^ b
+            elif op == IFF:
+                stack[sp - 1] = a == b
+            else:
+                stack[sp - 1] = not a or b
+
+        # Return the result or None if there is no result
+        return stack[sp - 1] if sp else None
+
+def compile_postfix(postfix_tokens : list, variables : list = None) -> Program:
+    """Compiles postfix tokens into a program
+
+    If variables is given, the program reads the values in that order (it must have every variable),
+    otherwise they are in the order they are first used."""
+
+    if variables is None:
+        variables = list(dict.fromkeys(token.name for token in postfix_tokens if isinstance(token, Variable)))
+
+    indexes = {var: i for i, var in enumerate(variables)}
+
+    opcodes = array("B")
+    operands = array("I")
+
+    depth = 0      # The current size of the stack
+    max_depth = 0  # The largest it gets
+
+    for token in postfix_tokens:
+        if isinstance(token, Variable):
+            opcodes.append(LOAD)
+            operands.append(indexes[token.name])
+
+            depth += 1
+            max_depth = max(max_depth, depth)
+            continue
+
+        if isinstance(token, Nary) and type(token.operator) in NARY_OPCODES:
+            if depth < token.count:
+                raise ValueError("Missing operand for " + str(token))
+
+            opcodes.append(NARY_OPCODES[type(token.operator)])
+            operands.append(token.count)
+
+            depth -= token.count - 1
+            continue
+
+        if isinstance(token, Operator) and type(token) in OPCODES:
+            # Not takes one value, the others take two and leave one
+            needed = 1 if isinstance(token, Not) else 2
+
+            if depth < needed:
+                raise ValueError("Missing operand for " + str(token))
+
+            opcodes.append(OPCODES[type(token)])
+            operands.append(0)
+
+            depth -= needed - 1
+            continue
+
+        raise ValueError("Invalid token")
+
+    return Program(opcodes, operands, tuple(variables), max_depth)
@@ -0,0 +1,138 @@
+# This file is used to run long truth table jobs in shards that are saved to disk as they finish.
+#
+# A job directory holds a manifest describing the job and one file per finished shard. Restarting a job skips
+# the shards that already have a file, and several processes (or machines sharing the directory) can split a
+# job between them by each taking every num_workers-th shard.
+
+from .evaluator import *
+from .bitwise import evaluate_bits
+
+import json
+import os
+
+# The number of rows in each shard (this must be a power of two)
+DEFAULT_SHARD_SIZE = 2 ** 16
+
+MANIFEST_NAME = "manifest.json"
+
+def _shard_path(directory : str, index : int) -> str:
+    return os.path.join(directory, "shard-%08d.bin" % index)
+
+def _write_atomic(path : str, data : bytes):
+    """Writes the file in one go, this way a crash never leaves a half written file behind"""
+
+    temp_path = "%s.%d.tmp" % (path, os.getpid())
+
+    with open(temp_path, "wb") as file:
+        file.write(data)
+
+    os.replace(temp_path, path)
+
+def _manifest(expression : str, sort_vars : bool, shard_size : int) -> dict:
+    """Gets the manifest for a job"""
+
+    if shard_size < 1 or shard_size & (shard_size - 1):
+        raise ValueError("Shard size must be a power of two")
+
+    _, variables = parse(expression, sort_vars)
+
+    num_rows = 2 ** len(variables)
+    shard_size = min(shard_size, num_rows)
+
+    return {
+        "expression": expression,
+        "variables": variables,
+        "shard_size": shard_size,
+        "num_shards": num_rows // shard_size
+    }
+
+def read_manifest(directory : str) -> dict:
+    """Gets the manifest of a job"""
+
+    with open(os.path.join(directory, MANIFEST_NAME)) as file:
+        return json.load(file)
+
+def run_shards(expression : str, directory : str, sort_vars : bool = False, shard_size : int = DEFAULT_SHARD_SIZE, worker : int = 0, num_workers : int = 1, max_shards : int = None) -> int:
+    """Evaluates the shards of the job that haven't been done yet, returns the number of shards evaluated
+
+    This worker only takes the shards where index % num_workers == worker. If max_shards is given, it stops
+    after evaluating that many."""
+
+    if not 0 <= worker < num_workers:
+        raise ValueError("Worker must be between 0 and num_workers - 1")
+
+    manifest = _manifest(expression, sort_vars, shard_size)
+
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST_NAME)
+
+    # Make sure a restart (or another worker) is running the same job
+    if os.path.exists(manifest_path):
+        if read_manifest(directory) != manifest:
+            raise ValueError("The directory holds a different job")
+    else:
+        _write_atomic(manifest_path, json.dumps(manifest).encode("utf-8"))
+
+    postfix_tokens, variables = parse(expression, sort_vars)
+
+    if not postfix_tokens:
+        raise ValueError("There is no result to enumerate")
+
+    shard_size = manifest["shard_size"]
+    done = 0
+
+    for index in range(worker, manifest["num_shards"], num_workers):
+        if max_shards is not None and done >= max_shards:
+            break
+
+        path = _shard_path(directory, index)
+
+        # Already finished
+        if os.path.exists(path):
+            continue
+
+        bits = evaluate_bits(postfix_tokens, variables, index * shard_size, shard_size)
+
+        _write_atomic(path, bits.to_bytes((shard_size + 7) // 8, "little"))
+        done += 1
+
+    return done
+
+def progress(directory : str) -> tuple:
+    """Gets the number of finished shards and the total number of shards"""
+
+    manifest = read_manifest(directory)
+    finished = sum(1 for index in range(manifest["num_shards"]) if os.path.exists(_shard_path(directory, index)))
+
+    return finished, manifest["num_shards"]
+
+def read_shard(directory : str, index : int) -> int:
+    """Gets the bitmask of the results of a finished shard (bit j being its j-th row)"""
+
+    path = _shard_path(directory, index)
+
+    if not os.path.exists(path):
+        raise ValueError("Shard %d hasn't finished" % index)
+
+    with open(path, "rb") as file:
+        return int.from_bytes(file.read(), "little")
+
+def iter_results(directory : str):
+    """Yields the rows of a finished job in order, just like iter_truth_table"""
+
+    manifest = read_manifest(directory)
+
+    variables = manifest["variables"]
+    num_variables = len(variables)
+    shard_size = manifest["shard_size"]
+
+    for index in range(manifest["num_shards"]):
+        bits = read_shard(directory, index)
+
+        for j in range(shard_size):
+            row = index * shard_size + j
+
+            # Create the variables with their values
+            variables_dict = {var: (row >> (num_variables - 1 - i)) & 1 == 1 for i, var in enumerate(variables)}
+
+            yield [variables_dict, (bits >> j) & 1 == 1]
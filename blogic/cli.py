@@ -0,0 +1,213 @@
+# This file is used to provide the blogic command line tool.
+#
+# The evaluator (and the process pool) are only imported once the arguments have been parsed,
+# this way short jobs (and --help) start quickly.
+
+import argparse
+import sys
+
+# The number of rows evaluated at once (and by each worker)
+DEFAULT_CHUNK_SIZE = 4096
+
+# The csv/tsv columns of the summary modes
+COUNT_COLUMNS = ["expression", "models", "rows"]
+SAT_COLUMNS = ["expression", "satisfiable"]
+
+def _parser() -> argparse.ArgumentParser:
+    """Creates the argument parser"""
+
+    parser = argparse.ArgumentParser(prog="blogic", description="Streams truth tables, model counts or satisfiability results for boolean expressions")
+
+    parser.add_argument("expressions", nargs="*", help="expressions to evaluate (read from stdin, one per line, if none are given)")
+    parser.add_argument("-f", "--file", action="append", default=[], help="read expressions from a file, one per line (can be repeated)")
+    parser.add_argument("-m", "--mode", choices=["table", "count", "sat"], default="table", help="what to output for each expression (default: table)")
+    parser.add_argument("--format", choices=["csv", "tsv", "jsonl"], default="csv", help="output format (default: csv)")
+    parser.add_argument("--sort-vars", action="store_true", help="sort the variables by name")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="number of rows evaluated at once (default: %d)" % DEFAULT_CHUNK_SIZE)
+
+    return parser
+
+def _read_expressions(args) -> list:
+    """Gets the expressions from the arguments, the files or stdin"""
+
+    expressions = list(args.expressions)
+
+    # Read the files
+    for path in args.file:
+        with open(path) as file:
+            expressions.extend(line.strip() for line in file)
+
+    # Fall back on stdin
+    if not args.expressions and not args.file:
+        expressions.extend(line.strip() for line in sys.stdin)
+
+    # Ignore blank lines
+    return [expression for expression in expressions if expression]
+
+def _iter_chunks(postfix_tokens : list, variables : list, chunk_size : int, pool, workers : int):
+    """Yields the chunks of the truth table in order, evaluating them in the pool if there is one"""
+
+    from .evaluator import compile_range, evaluate_range, iter_chunks
+
+    # Evaluate in this process
+    if pool is None:
+        yield from iter_chunks(postfix_tokens, variables, chunk_size)
+        return
+
+    from collections import deque
+
+    # Compile once, the program is sent to the workers with each chunk
+    program = compile_range(postfix_tokens, variables)
+
+    num_rows = 2 ** len(variables)
+    starts = iter(range(0, num_rows, chunk_size))
+
+    # Only keep a few chunks in flight, this way big tables don't queue up millions of futures
+    window = workers * 2
+    pending = deque()
+
+    try:
+        for start in starts:
+            pending.append(pool.submit(evaluate_range, program, variables, start, min(start + chunk_size, num_rows)))
+
+            # Wait for the oldest chunk once the window is full
+            if len(pending) >= window:
+                yield pending.popleft().result()
+
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        # Stop any chunks that aren't needed anymore (i.e. sat found a model)
+        for future in pending:
+            future.cancel()
+
+class _Writer:
+    """Writes the results in the chosen format"""
+
+    def __init__(self, format : str, out):
+        import csv
+        import json
+
+        self.format = format
+        self.out = out
+        self.json = json
+
+        if format != "jsonl":
+            self.csv = csv.writer(out, delimiter="\t" if format == "tsv" else ",", lineterminator="\n")
+
+    def table(self, expression : str, variables : list, rows : list = None):
+        """Writes the header of a table (if rows is None) or some of its rows"""
+
+        if self.format == "jsonl":
+            for values, result in rows or []:
+                self.out.write(self.json.dumps({"expression": expression, "values": values, "result": result}) + "\n")
+            return
+
+        if rows is None:
+            self.csv.writerow(variables + ["result"])
+            return
+
+        self.csv.writerows(
+            [int(values[var]) for var in variables] + ["" if result is None else int(result)]
+            for values, result in rows
+        )
+
+    def record(self, record : dict, columns : list):
+        """Writes a single count/sat result (only the columns are written for csv/tsv)"""
+
+        if self.format == "jsonl":
+            self.out.write(self.json.dumps(record) + "\n")
+            return
+
+        self.csv.writerow([int(record[column]) if isinstance(record[column], bool) else record[column] for column in columns])
+
+def _run(expressions : list, args, out) -> None:
+    """Evaluates every expression and writes the results"""
+
+    from .evaluator import parse
+
+    pool = None
+
+    if args.workers > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        pool = ProcessPoolExecutor(max_workers=args.workers)
+
+    writer = _Writer(args.format, out)
+
+    # Headers for the summary modes
+    if args.format != "jsonl" and args.mode == "count":
+        writer.csv.writerow(COUNT_COLUMNS)
+    elif args.format != "jsonl" and args.mode == "sat":
+        writer.csv.writerow(SAT_COLUMNS)
+
+    try:
+        for expression in expressions:
+            postfix_tokens, variables = parse(expression, args.sort_vars)
+            chunks = _iter_chunks(postfix_tokens, variables, args.chunk_size, pool, args.workers)
+
+            if args.mode == "table":
+                writer.table(expression, variables)
+
+                # Write each chunk as soon as it is done
+                for chunk in chunks:
+                    writer.table(expression, variables, chunk)
+                    out.flush()
+
+            elif args.mode == "count":
+                models = 0
+
+                for chunk in chunks:
+                    models += sum(1 for _, result in chunk if result)
+
+                writer.record({"expression": expression, "models": models, "rows": 2 ** len(variables)}, COUNT_COLUMNS)
+
+            else:
+                model = None
+
+                # Stop at the first satisfying row
+                for chunk in chunks:
+                    model = next((values for values, result in chunk if result), None)
+
+                    if model is not None:
+                        break
+
+                chunks.close()
+
+                writer.record({"expression": expression, "satisfiable": model is not None, "model": model}, SAT_COLUMNS)
+
+            out.flush()
+    finally:
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+
+def main(argv : list = None) -> int:
+    """Runs the command line tool, returns the exit code"""
+
+    parser = _parser()
+    args = parser.parse_args(argv)
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    expressions = _read_expressions(args)
+
+    try:
+        _run(expressions, args, sys.stdout)
+    except (ValueError, IndexError) as e:
+        # Invalid expressions (missing operands show up as an empty stack)
+        print("blogic: error: " + str(e), file=sys.stderr)
+        return 1
+    except KeyboardInterrupt:
+        return 130
+    except BrokenPipeError:
+        # The reader has gone (i.e. piped into head)
+        return 0
+
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
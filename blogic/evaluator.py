@@ -1,4 +1,13 @@
 from .tokeniser import *
+from .bitwise import compile_shared, evaluate_shared, DEFAULT_BLOCK_SIZE
+from .bytecode import compile_postfix
+from .support import find_support
+
+import os
+
+# Batches are only split into chunks of at least this many assignments by default (smaller ones run inline,
+# as handing them to an executor costs more than evaluating them)
+MIN_BATCH_CHUNK_SIZE = 4096
 
 def evaluate_postfix(postfix_tokens : list, variables : dict) -> bool:
     """Evaluate the postfix tokens"""
@@ -27,6 +36,17 @@ def evaluate_postfix(postfix_tokens : list, variables : dict) -> bool:
 
             continue
 
+        # Handle flattened chains
+        if isinstance(token, Nary):
+            # Get the arguments
+            args = stack[-token.count:]
+            del stack[-token.count:]
+
+            # Evaluate
+            stack.append(token.perform(args))
+
+            continue
+
         # Handle operators
         if isinstance(token, Operator):
             # Get the arguments
@@ -50,23 +70,61 @@ def evaluate(expression : str, variables : dict) -> bool:
     # Tokenise
     tokens = tokenise(expression)
     
-    # Shunt
+    # Shunt (flattening chains isn't worth it for a single evaluation, parse and compile_expression do it)
     postfix_tokens = shunt(tokens)
-    
-    # Evaluate
+
+    # Evaluate (compiling isn't worth it either, use compile_expression to evaluate many times)
     return evaluate_postfix(postfix_tokens, variables)
 
-def evaluate_all(expressions : str, sort_vars : bool = False) -> list:
-    """Generates a truth table for the expressions"""
-    
-    # Tokenise
-    tokens = tokenise(expressions)
+def compile_expression(expressions : str, sort_vars : bool = False):
+    """Compiles the expressions into a program that can be run many times (and shared between threads)"""
 
-    # Shunt
-    postfix_tokens = shunt(tokens)
+    # Get the program
+    postfix_tokens, variables = parse(expressions, sort_vars)
 
-    # Get the variables
-    variables = set()
+    return compile_postfix(postfix_tokens, variables)
+
+def evaluate_batch(program, assignments : list, executor = None, chunk_size : int = None) -> list:
+    """Evaluates a compiled program (or an expression) once for each dict of values
+
+    If an executor is given, the assignments are split into chunks that are evaluated in it (by default a chunk per
+    CPU, but never smaller than MIN_BATCH_CHUNK_SIZE). Programs are never changed once compiled, so every thread
+    shares the same one."""
+
+    # Compile expressions once for the whole batch
+    if isinstance(program, str):
+        program = compile_expression(program)
+
+    assignments = list(assignments)
+
+    # Default to a chunk per CPU (unless that makes them too small)
+    if chunk_size is None:
+        chunk_size = max(MIN_BATCH_CHUNK_SIZE, -(-len(assignments) // (os.cpu_count() or 1)))
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    # Not worth splitting up
+    if executor is None or len(assignments) <= chunk_size:
+        return program.evaluate_many(assignments)
+
+    futures = [
+        executor.submit(program.evaluate_many, assignments[start:start + chunk_size])
+        for start in range(0, len(assignments), chunk_size)
+    ]
+
+    # Put the results back together in order
+    results = []
+    for future in futures:
+        results.extend(future.result())
+
+    return results
+
+def get_variables(tokens : list, sort_vars : bool = False) -> list:
+    """Gets the unique variable names used by the tokens"""
+
+    # Use a dict to remove duplicates while keeping the order they first appear in
+    variables = {}
 
     # Get the variables
     for token in tokens:
@@ -74,46 +132,192 @@ def evaluate_all(expressions : str, sort_vars : bool = False) -> list:
         if not isinstance(token, Variable):
             continue
 
-        # Add the variable to the set (to remove duplicates)
-        variables.add(token.name)
-    
+        # Add the variable to the dict (to remove duplicates)
+        variables[token.name] = None
+
+    # Get the variable names
+    variables = list(variables)
+
+    # Sort the variables, by name, this way the truth table is always in the same order
+    if sort_vars:
+        variables.sort()
+
+    return variables
+
+def compile_range(postfix_tokens : list, variables : list, fixed : dict = None):
+    """Compiles the postfix tokens into a program for evaluate_range (it reads the variables, then the fixed ones)"""
+
+    return compile_postfix(postfix_tokens, list(variables) + list(fixed or {}))
+
+def evaluate_range(program, variables : list, start : int, stop : int, fixed : dict = None) -> list:
+    """Evaluates the rows of the truth table from start (inclusive) to stop (exclusive)
+
+    The program must come from compile_range (compile it once and use it for every range). Any variables used by
+    the program but not enumerated must be given a value in fixed (they aren't added to the rows)."""
+
+    fixed_values = list((fixed or {}).values())
+
     # Get the number of variables
     num_variables = len(variables)
 
-    # Get the number of rows (i.e. 2^num_variables)
-    num_rows = 2 ** num_variables
+    # The bit of the row number that holds each variable (the first variable is the most significant bit of the row)
+    shifts = [num_variables - 1 - i for i in range(num_variables)]
+
+    # Rows in the range
+    rows = []
+
+    # Iterate over the rows
+    for row in range(start, stop):
+        # Get the values
+        values = [(row >> shift) & 1 == 1 for shift in shifts]
+
+        # Evaluate
+        result = program.run(values + fixed_values)
+
+        # Create the variables with their values
+        variables_dict = dict(zip(variables, values))
+
+        # Add the row to the range
+        rows.append([variables_dict, result])
+
+    return rows
+
+def parse(expressions : str, sort_vars : bool = False) -> tuple:
+    """Gets the postfix tokens and the variables of the expressions"""
+
+    # Tokenise
+    tokens = tokenise(expressions)
+
+    # Shunt (and flatten chains of the same operator)
+    postfix_tokens = flatten(shunt(tokens))
+
+    # Get the variables
+    return postfix_tokens, get_variables(tokens, sort_vars)
+
+def parse_stream(stream, sort_vars : bool = False, chunk_size : int = 2 ** 16) -> tuple:
+    """Gets the postfix tokens and the variables of an expression read from a text stream
+
+    The stream is tokenised a chunk at a time straight into shunt, so only the postfix output is kept in memory."""
+
+    # Tokenise and shunt as the stream is read
+    postfix_tokens = flatten(shunt(tokenise_stream(stream, chunk_size)))
+
+    # Get the variables (they are in the same order in the postfix output as in the expression)
+    return postfix_tokens, get_variables(postfix_tokens, sort_vars)
+
+def iter_chunks(postfix_tokens : list, variables : list, chunk_size : int = 4096, start : int = 0, stop : int = None, fixed : dict = None):
+    """Yields the rows of the truth table in lists of at most chunk_size rows"""
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    # Default to the end of the table (i.e. 2^num_variables)
+    if stop is None:
+        stop = 2 ** len(variables)
+
+    # Compile once for every chunk
+    program = compile_range(postfix_tokens, variables, fixed)
+
+    # Evaluate one chunk at a time, this way only a single chunk is ever held in memory
+    for chunk_start in range(start, stop, chunk_size):
+        yield evaluate_range(program, variables, chunk_start, min(chunk_start + chunk_size, stop), fixed)
+
+def iter_truth_table(expressions : str, sort_vars : bool = False, chunk_size : int = 4096, reduce_support : bool = False):
+    """Yields the rows of the truth table for the expressions one at a time
+
+    If reduce_support is set, only the variables that can change the result are enumerated."""
+
+    # Get the program
+    postfix_tokens, variables = parse(expressions, sort_vars)
+
+    fixed = None
+
+    # Drop the variables that don't matter (they can have any value, so they are left as false)
+    if reduce_support:
+        support = find_support(postfix_tokens, variables)
+        fixed = {var: False for var in variables if var not in support}
+        variables = support
+
+    # Yield the rows chunk by chunk
+    for chunk in iter_chunks(postfix_tokens, variables, chunk_size, fixed=fixed):
+        yield from chunk
+
+def evaluate_all(expressions : str, sort_vars : bool = False, reduce_support : bool = False) -> list:
+    """Generates a truth table for the expressions
+
+    If reduce_support is set, the table only has the variables that can change the result (use expand_truth_table
+    to get the full table back from it)."""
+
+    # Build the whole truth table
+    return list(iter_truth_table(expressions, sort_vars, reduce_support=reduce_support))
+
+def expand_truth_table(rows : list, variables : list):
+    """Yields the rows of the full truth table over variables from a table built with reduce_support
+
+    The results are looked up in the reduced table, so nothing is evaluated again."""
+
+    # Get the variables of the reduced table
+    support = list(rows[0][0]) if rows else []
+
+    num_variables = len(variables)
+
+    # Where each variable of the reduced table is in the full table (as the bit of the row number)
+    shifts = [num_variables - 1 - variables.index(var) for var in support]
+
+    for row in range(2 ** num_variables):
+        # Get the row of the reduced table with the same values for the relevant variables
+        index = 0
+        for shift in shifts:
+            index = (index << 1) | ((row >> shift) & 1)
+
+        # Create the variables with their values
+        variables_dict = {var: (row >> (num_variables - 1 - i)) & 1 == 1 for i, var in enumerate(variables)}
+
+        yield [variables_dict, rows[index][1]]
+
+
+def evaluate_all_many(expressions : list, sort_vars : bool = False) -> list:
+    """Generates one truth table for several expressions, each row holds a result per expression
+
+    All of the expressions share the same enumeration and subterms they have in common are only evaluated once."""
+
+    postfix_lists = [] # The postfix tokens of each expression
+    variables = {}     # The variables of every expression (a dict to keep them in order)
+
+    for expression in expressions:
+        postfix_tokens, expression_variables = parse(expression)
+
+        postfix_lists.append(postfix_tokens)
+        variables.update(dict.fromkeys(expression_variables))
 
-    # Get the variable names
     variables = list(variables)
 
     # Sort the variables, by name, this way the truth table is always in the same order
     if sort_vars:
         variables.sort()
 
+    # Compile all of the expressions into one program
+    nodes, outputs = compile_shared(postfix_lists)
+
+    num_variables = len(variables)
+    num_rows = 2 ** num_variables
+    block_size = min(num_rows, DEFAULT_BLOCK_SIZE)
+
     # Truth table
     truth_table = []
 
-    # Iterate over the rows
-    for row in range(num_rows):
-        # Convert the row to a binary string (used for the binary representation of the row's boolean inputs)
-        binary = bin(row)[2:].zfill(num_variables)
+    # Evaluate a block of rows at a time
+    for start in range(0, num_rows, block_size):
+        results = evaluate_shared(nodes, outputs, variables, start, block_size)
 
-        # Create the variables with their values
-        variables_dict = {}
+        for j in range(block_size):
+            row = start + j
 
-        # Iterate over the variables
-        for i, var in enumerate(variables):
-            # Get the value
-            val = binary[i] == "1"
+            # Create the variables with their values
+            variables_dict = {var: (row >> (num_variables - 1 - i)) & 1 == 1 for i, var in enumerate(variables)}
 
-            # Add it to the variables dict
-            variables_dict[var] = val
-        
-        # Evaluate
-        result = evaluate_postfix(postfix_tokens, variables_dict)
+            # Pick out this row's bit of each result
+            truth_table.append([variables_dict, [None if result is None else (result >> j) & 1 == 1 for result in results]])
 
-        # Add the row to the truth table
-        truth_table.append([variables_dict, result])
-    
     # Return the truth table
-    return truth_table
\ No newline at end of file
+    return truth_table
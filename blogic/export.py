@@ -0,0 +1,163 @@
+# This file is used to write truth tables to files without building the whole table in memory.
+
+from .evaluator import *
+
+import csv
+import json
+import struct
+
+# The number of rows that are evaluated (and held in memory) at once
+DEFAULT_CHUNK_SIZE = 4096
+
+# The bytes every packed file starts with (followed by the format version)
+PACKED_MAGIC = b"BLGC"
+PACKED_VERSION = 1
+
+def _filter_rows(rows : list, only) -> list:
+    """Keeps the rows whose result matches only (or all of them if only is None)"""
+
+    if only is None:
+        return rows
+
+    return [row for row in rows if row[1] == only]
+
+def export_csv(expression : str, file, sort_vars : bool = False, only : bool = None, delimiter : str = ",", result_name : str = "result", chunk_size : int = DEFAULT_CHUNK_SIZE) -> int:
+    """Writes the truth table of the expression to a text file as CSV, returns the number of rows written"""
+
+    # Get the program
+    postfix_tokens, variables = parse(expression, sort_vars)
+
+    # Create the writer
+    writer = csv.writer(file, delimiter=delimiter, lineterminator="\n")
+
+    # Write the header (inputs on the left and the output on the right)
+    writer.writerow(variables + [result_name])
+
+    written = 0 # The number of rows written
+
+    # Write the table chunk by chunk
+    for chunk in iter_chunks(postfix_tokens, variables, chunk_size):
+        rows = _filter_rows(chunk, only)
+
+        # Write the values as 1s and 0s
+        writer.writerows(
+            [int(values[var]) for var in variables] + ["" if result is None else int(result)]
+            for values, result in rows
+        )
+
+        written += len(rows)
+
+    return written
+
+def export_tsv(expression : str, file, sort_vars : bool = False, only : bool = None, result_name : str = "result", chunk_size : int = DEFAULT_CHUNK_SIZE) -> int:
+    """Writes the truth table of the expression to a text file as TSV, returns the number of rows written"""
+
+    return export_csv(expression, file, sort_vars, only, "\t", result_name, chunk_size)
+
+def _pack_column(values) -> bytes:
+    """Packs a column of booleans into bytes (the first value is the lowest bit of the first byte)"""
+
+    values = list(values)
+    packed = 0
+
+    # Set a bit for every true value
+    for i, val in enumerate(values):
+        if val:
+            packed |= 1 << i
+
+    return packed.to_bytes((len(values) + 7) // 8, "little")
+
+def export_packed(expression : str, file, sort_vars : bool = False, only : bool = None, chunk_size : int = DEFAULT_CHUNK_SIZE) -> int:
+    """Writes the truth table of the expression to a binary file in the bit-packed columnar format, returns the number of rows written
+
+    The file starts with the magic bytes, the version and a length-prefixed JSON header holding the variables.
+    It is followed by row groups (one per chunk), each being the number of rows followed by one bit-packed column
+    per variable and a final column for the result."""
+
+    # Get the program
+    postfix_tokens, variables = parse(expression, sort_vars)
+
+    # Write the header
+    header = json.dumps({"variables": variables, "only": only}).encode("utf-8")
+
+    file.write(PACKED_MAGIC + bytes([PACKED_VERSION]))
+    file.write(struct.pack("<I", len(header)))
+    file.write(header)
+
+    written = 0 # The number of rows written
+
+    # Write a row group per chunk
+    for chunk in iter_chunks(postfix_tokens, variables, chunk_size):
+        rows = _filter_rows(chunk, only)
+
+        # Don't bother writing empty groups
+        if not rows:
+            continue
+
+        # Write the number of rows in the group
+        file.write(struct.pack("<I", len(rows)))
+
+        # Write the input columns
+        for var in variables:
+            file.write(_pack_column(values[var] for values, _ in rows))
+
+        # Write the result column
+        file.write(_pack_column(result for _, result in rows))
+
+        written += len(rows)
+
+    return written
+
+def _read_exactly(file, size : int) -> bytes:
+    """Reads exactly size bytes from the file"""
+
+    data = file.read(size)
+
+    if len(data) != size:
+        raise ValueError("Truncated packed file")
+
+    return data
+
+def read_packed(file):
+    """Yields the rows of a truth table written by export_packed"""
+
+    # Check the magic bytes
+    magic = file.read(len(PACKED_MAGIC) + 1)
+
+    if magic[:len(PACKED_MAGIC)] != PACKED_MAGIC:
+        raise ValueError("Not a packed truth table")
+
+    if magic[len(PACKED_MAGIC):] != bytes([PACKED_VERSION]):
+        raise ValueError("Unsupported packed version")
+
+    # Read the header
+    header_size, = struct.unpack("<I", _read_exactly(file, 4))
+    header = json.loads(_read_exactly(file, header_size).decode("utf-8"))
+
+    variables = header["variables"]
+
+    # Read the row groups until the end of the file
+    while True:
+        size = file.read(4)
+
+        # Done
+        if not size:
+            return
+
+        if len(size) != 4:
+            raise ValueError("Truncated packed file")
+
+        num_rows, = struct.unpack("<I", size)
+        column_size = (num_rows + 7) // 8
+
+        # Read every column (the result being the last one)
+        columns = [
+            int.from_bytes(_read_exactly(file, column_size), "little")
+            for _ in range(len(variables) + 1)
+        ]
+
+        # Unpack the rows
+        for i in range(num_rows):
+            values = {var: (columns[j] >> i) & 1 == 1 for j, var in enumerate(variables)}
+
+            yield [values, (columns[-1] >> i) & 1 == 1]
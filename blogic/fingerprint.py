@@ -0,0 +1,34 @@
+# This file is used to hash what an expression means rather than how it is written.
+
+from .evaluator import *
+from .bitwise import evaluate_bits
+from .bdd import BDD
+
+import hashlib
+import json
+
+# Up to this many variables the whole truth table is hashed, beyond it the BDD is (changing this changes the
+# fingerprints, so it isn't shared with the other analyses)
+MAX_BITMASK_VARIABLES = 16
+
+def fingerprint(expression : str) -> str:
+    """Gets a hash of the boolean function of the expression over its sorted variables
+
+    Expressions that give the same truth table over the same variables (i.e. 'A' AND 'B' and -(-'B' OR -'A'))
+    get the same fingerprint."""
+
+    # Sort the variables, this way the order they are written in doesn't matter
+    postfix_tokens, variables = parse(expression, sort_vars=True)
+
+    if not postfix_tokens:
+        # There is no result
+        payload = {"variables": variables, "none": True}
+    elif len(variables) <= MAX_BITMASK_VARIABLES:
+        # Small enough to hash the truth table itself
+        payload = {"variables": variables, "bits": "%x" % evaluate_bits(postfix_tokens, variables)}
+    else:
+        # Hash the BDD (there is only one for each function with a given variable order)
+        bdd = BDD(variables)
+        payload = {"variables": variables, "bdd": bdd.serialise(bdd.from_postfix(postfix_tokens))}
+
+    return hashlib.sha256(json.dumps(payload).encode("utf-8")).hexdigest()
@@ -0,0 +1,37 @@
+# This file is used to measure how much each variable affects the result of an expression.
+
+from .evaluator import *
+from .bitwise import evaluate_bits, flip_rows, MAX_BITMASK_VARIABLES
+from .bdd import BDD
+
+def influence(expression : str, sort_vars : bool = False) -> dict:
+    """Gets, for each variable, the number of assignments where toggling it changes the result
+
+    Divide by 2 ** len(variables) to get the fraction of assignments (the usual influence of the variable)."""
+
+    # Get the program
+    postfix_tokens, variables = parse(expression, sort_vars)
+
+    if not postfix_tokens:
+        raise ValueError("There is no result to analyse")
+
+    num_variables = len(variables)
+
+    if num_variables > MAX_BITMASK_VARIABLES:
+        bdd = BDD(variables)
+        u = bdd.from_postfix(postfix_tokens)
+
+        counts = {}
+
+        for i, var in enumerate(variables):
+            # The derivative is true where the two cofactors differ
+            derivative = bdd.apply(Xor(), bdd.restrict(u, i, False), bdd.restrict(u, i, True))
+
+            counts[var] = bdd.count(derivative)
+
+        return counts
+
+    bits = evaluate_bits(postfix_tokens, variables)
+
+    # Each row where flipping the variable changes the result is two assignments that flip the result
+    return {var: 2 * flip_rows(bits, i, num_variables).bit_count() for i, var in enumerate(variables)}
@@ -0,0 +1,70 @@
+# This file is used to remove variables from an expression by quantifying over them.
+#
+# exists(expression, vars) is true for an assignment of the other variables if some values of vars make the
+# expression true, and forall(expression, vars) if every value of them does. Both are worked out on the BDD
+# of the expression, so nothing is enumerated.
+
+from .evaluator import *
+from .bdd import BDD, FALSE, TRUE
+from .bytecode import BaseProgram
+
+from array import array
+
+class DecisionProgram(BaseProgram):
+    """A BDD compiled for evaluating, it can be used just like a compiled Program
+
+    Each evaluation follows a single path from the root to a terminal, so it takes at most one step per variable
+    and nodes reached by several paths are only stored once."""
+
+    def __init__(self, bdd : BDD, u : int, variables : list):
+        indexes = {var: i for i, var in enumerate(variables)}
+
+        self.variables = tuple(variables) # The variable names, in the order the values are given in
+
+        # Node n (after the terminals) tests the value at indexes[n - 2] and goes to lows[n - 2] or highs[n - 2]
+        self.root, nodes = bdd.serialise(u)
+
+        self.indexes = array("I", (indexes[bdd.variables[level]] for level, _, _ in nodes))
+        self.lows = array("I", (low for _, low, _ in nodes))
+        self.highs = array("I", (high for _, _, high in nodes))
+
+    def run(self, values : list) -> bool:
+        """Runs the program with the values of the variables (in the same order as the variables)"""
+
+        u = self.root
+
+        while u > TRUE:
+            u = self.highs[u - 2] if values[self.indexes[u - 2]] else self.lows[u - 2]
+
+        return u == TRUE
+
+def _quantify(expression : str, variables : list, operator : Operator, sort_vars : bool) -> DecisionProgram:
+    """Quantifies the expression over the variables by combining their cofactors with the operator"""
+
+    # Get the program
+    postfix_tokens, all_variables = parse(expression, sort_vars)
+
+    if not postfix_tokens:
+        raise ValueError("There is no result to quantify")
+
+    for var in variables:
+        if var not in all_variables:
+            raise ValueError("Unknown variable: " + var)
+
+    bdd = BDD(all_variables)
+    levels = {all_variables.index(var) for var in variables}
+
+    u = bdd.quantify(bdd.from_postfix(postfix_tokens), levels, operator)
+
+    # The program reads the remaining variables
+    return DecisionProgram(bdd, u, [var for var in all_variables if var not in variables])
+
+def exists(expression : str, variables : list, sort_vars : bool = False) -> DecisionProgram:
+    """Gets a program over the other variables that is true if some values of variables make the expression true"""
+
+    return _quantify(expression, variables, Or(), sort_vars)
+
+def forall(expression : str, variables : list, sort_vars : bool = False) -> DecisionProgram:
+    """Gets a program over the other variables that is true if every value of variables makes the expression true"""
+
+    return _quantify(expression, variables, And(), sort_vars)
@@ -0,0 +1,117 @@
+# This file is used to estimate how often an expression is true without enumerating every row.
+
+from .evaluator import *
+from .bitwise import evaluate_masks
+
+from collections import namedtuple
+from statistics import NormalDist
+
+import math
+import random
+
+# The number of samples evaluated at once (each variable gets one random bit per sample)
+DEFAULT_BATCH_SIZE = 2 ** 12
+
+# The result of estimate_true_fraction, low and high being the bounds of the confidence interval
+Estimate = namedtuple("Estimate", ["fraction", "low", "high", "samples", "confidence"])
+
+def _z(confidence : float) -> float:
+    """Gets the number of standard deviations either side of the mean that covers the confidence"""
+
+    if not 0 < confidence < 1:
+        raise ValueError("Confidence must be between 0 and 1")
+
+    return NormalDist().inv_cdf((1 + confidence) / 2)
+
+def samples_for(margin : float, confidence : float = 0.95) -> int:
+    """Gets the number of samples needed for the interval to be at most margin either side of the estimate"""
+
+    if margin <= 0:
+        raise ValueError("Margin must be positive")
+
+    # The worst case is a fraction of a half
+    return math.ceil(_z(confidence) ** 2 * 0.25 / margin ** 2)
+
+def _count_true(postfix_tokens : list, variables : list, fixed : dict, samples : int, rng : random.Random, batch_size : int) -> int:
+    """Counts how many random assignments are true, the fixed variables being the same for every sample"""
+
+    true = 0
+
+    for start in range(0, samples, batch_size):
+        size = min(batch_size, samples - start)
+        mask = (1 << size) - 1
+
+        # Give every variable a random bit per sample
+        masks = {var: mask if fixed[var] else 0 for var in fixed}
+        masks.update({var: rng.getrandbits(size) for var in variables if var not in fixed})
+
+        true += evaluate_masks(postfix_tokens, masks, mask).bit_count()
+
+    return true
+
+def estimate_true_fraction(expression : str, samples : int = None, confidence : float = 0.95, margin : float = 0.005, stratify : list = None, seed = None, batch_size : int = DEFAULT_BATCH_SIZE) -> Estimate:
+    """Estimates the fraction of assignments that make the expression true from random samples
+
+    If samples isn't given, enough are taken for the interval to be within margin of the estimate.
+    The stratify variables are enumerated rather than sampled, with the samples split evenly between
+    each of their assignments (this lowers the variance when they have a big effect on the result)."""
+
+    z = _z(confidence)
+
+    if samples is None:
+        samples = samples_for(margin, confidence)
+
+    if samples < 1:
+        raise ValueError("Samples must be positive")
+
+    # Get the program
+    postfix_tokens, variables = parse(expression, sort_vars=True)
+
+    if not postfix_tokens:
+        raise ValueError("There is no result to estimate")
+
+    rng = random.Random(seed)
+    stratify = list(dict.fromkeys(stratify or []))
+
+    for var in stratify:
+        if var not in variables:
+            raise ValueError("Unknown variable: " + var)
+
+    # Simple random sampling
+    if not stratify:
+        true = _count_true(postfix_tokens, variables, {}, samples, rng, batch_size)
+        fraction = true / samples
+
+        # Wilson score interval (this behaves well even when the fraction is close to 0 or 1)
+        centre = (fraction + z * z / (2 * samples)) / (1 + z * z / samples)
+        spread = z * math.sqrt(fraction * (1 - fraction) / samples + z * z / (4 * samples * samples)) / (1 + z * z / samples)
+
+        return Estimate(fraction, max(0.0, centre - spread), min(1.0, centre + spread), samples, confidence)
+
+    # Stratified sampling, every stratum is equally likely
+    num_strata = 2 ** len(stratify)
+
+    # Every stratum needs at least one sample
+    if num_strata > samples:
+        raise ValueError("Too many stratify variables for %d samples (%d strata)" % (samples, num_strata))
+
+    per_stratum = samples // num_strata
+
+    fraction = 0.0
+    variance = 0.0
+
+    for stratum in range(num_strata):
+        # The first stratify variable is the most significant bit, just like evaluate_all
+        fixed = {var: (stratum >> (len(stratify) - 1 - i)) & 1 == 1 for i, var in enumerate(stratify)}
+
+        true = _count_true(postfix_tokens, variables, fixed, per_stratum, rng, batch_size)
+        fraction += true / per_stratum / num_strata
+
+        # Adjust the fraction towards a half like the Wilson interval does, otherwise strata where every sample
+        # is true (or false) would have no variance at all
+        adjusted = (true + z * z / 2) / (per_stratum + z * z)
+        variance += adjusted * (1 - adjusted) / (per_stratum + z * z) / num_strata ** 2
+
+    spread = z * math.sqrt(variance)
+
+    return Estimate(fraction, max(0.0, fraction - spread), min(1.0, fraction + spread), per_stratum * num_strata, confidence)
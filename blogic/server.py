@@ -0,0 +1,254 @@
+# This file is used to run a local evaluation server (HTTP/JSON, stdlib only).
+#
+# Endpoints:
+#   POST /evaluate      {"expression": "...", "assignments": [{"A": true, ...}, ...]} -> {"results": [...]}
+#   POST /evaluate_all  {"expression": "...", "sort_vars": false}                      -> {"variables": [...], "rows": [...]}
+#   GET  /stats                                                                        -> throughput and latency stats
+
+from .evaluator import *
+from .bytecode import compile_postfix
+
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import json
+import multiprocessing
+import threading
+import time
+
+# The number of rows each worker evaluates at once for evaluate_all jobs
+DEFAULT_CHUNK_SIZE = 4096
+
+# The most variables an evaluate_all job can have (every one doubles the size of the table)
+DEFAULT_MAX_VARIABLES = 16
+
+class TooLargeError(ValueError):
+    """Raised when a job is bigger than the server allows"""
+
+class ExpressionCache:
+    """A thread safe LRU cache of parsed expressions"""
+
+    def __init__(self, max_size : int = 1024):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, expression : str, sort_vars : bool = False) -> tuple:
+        """Gets the postfix tokens, variables and compiled program for the expression, parsing it if it isn't cached"""
+
+        key = (expression, sort_vars)
+
+        with self._lock:
+            if key in self._entries:
+                # Mark it as the most recently used
+                self._entries.move_to_end(key)
+                self.hits += 1
+
+                return self._entries[key]
+
+            self.misses += 1
+
+        # Parse outside of the lock so other threads aren't held up (the tokens and programs are never mutated)
+        postfix_tokens, variables = parse(expression, sort_vars)
+        parsed = (postfix_tokens, variables, compile_postfix(postfix_tokens, variables))
+
+        with self._lock:
+            self._entries[key] = parsed
+
+            # Remove the least recently used entries
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+        return parsed
+
+    def __len__(self):
+        return len(self._entries)
+
+class Stats:
+    """Thread safe request counters"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.endpoints = {}
+        self.rows = 0
+
+        self._lock = threading.Lock()
+
+    def record(self, endpoint : str, seconds : float, rows : int):
+        """Records a finished request"""
+
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {"requests": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+
+            stats["requests"] += 1
+            stats["total_seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+
+            self.rows += rows
+
+    def record_error(self, endpoint : str):
+        """Records a failed request"""
+
+        with self._lock:
+            stats = self.endpoints.setdefault(endpoint, {"requests": 0, "errors": 0, "total_seconds": 0.0, "max_seconds": 0.0})
+            stats["errors"] += 1
+
+    def snapshot(self) -> dict:
+        """Gets the stats as a JSON friendly dict"""
+
+        with self._lock:
+            uptime = time.monotonic() - self.started
+
+            endpoints = {}
+            for name, stats in self.endpoints.items():
+                endpoints[name] = dict(stats, mean_seconds=stats["total_seconds"] / stats["requests"] if stats["requests"] else 0.0)
+
+            return {
+                "uptime_seconds": uptime,
+                "rows": self.rows,
+                "rows_per_second": self.rows / uptime if uptime else 0.0,
+                "endpoints": endpoints
+            }
+
+class EvaluationServer(ThreadingHTTPServer):
+    """HTTP server that keeps parsed expressions cached and sends evaluate_all jobs to a process pool"""
+
+    daemon_threads = True
+
+    def __init__(self, address : tuple, workers : int = 0, cache_size : int = 1024, chunk_size : int = DEFAULT_CHUNK_SIZE, max_variables : int = DEFAULT_MAX_VARIABLES):
+        super().__init__(address, EvaluationHandler)
+
+        self.max_variables = max_variables
+
+        self.cache = ExpressionCache(cache_size)
+        self.stats = Stats()
+        self.chunk_size = chunk_size
+
+        # Without workers everything is evaluated on the request threads. The workers are started from request
+        # threads, so they are spawned (forking a process with several threads isn't safe).
+        self.pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) if workers else None
+
+    def evaluate(self, expression : str, assignments : list) -> list:
+        """Evaluates the expression once per assignment"""
+
+        _, _, program = self.cache.get(expression)
+
+        return [program.evaluate(variables) for variables in assignments]
+
+    def evaluate_all(self, expression : str, sort_vars : bool = False) -> tuple:
+        """Generates the truth table for the expression, returns the variables and the rows"""
+
+        _, variables, program = self.cache.get(expression, sort_vars)
+
+        # Don't let a single job take the server down
+        if len(variables) > self.max_variables:
+            raise TooLargeError("Too many variables (%d, at most %d are allowed)" % (len(variables), self.max_variables))
+
+        num_rows = 2 ** len(variables)
+
+        # Evaluate on this thread
+        if self.pool is None or num_rows <= self.chunk_size:
+            return variables, evaluate_range(program, variables, 0, num_rows)
+
+        # Split the table between the workers
+        starts = range(0, num_rows, self.chunk_size)
+        futures = [
+            self.pool.submit(evaluate_range, program, variables, start, min(start + self.chunk_size, num_rows))
+            for start in starts
+        ]
+
+        rows = []
+        for future in futures:
+            rows.extend(future.result())
+
+        return variables, rows
+
+    def server_close(self):
+        super().server_close()
+
+        if self.pool is not None:
+            self.pool.shutdown()
+
+class EvaluationHandler(BaseHTTPRequestHandler):
+    """Handles the requests for an EvaluationServer"""
+
+    def log_message(self, format, *args):
+        # Keep quiet, the stats endpoint is the way to see what is going on
+        pass
+
+    def _send_json(self, status : int, body : dict):
+        data = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> dict:
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length).decode("utf-8"))
+
+        if not isinstance(body, dict) or not isinstance(body.get("expression"), str):
+            raise ValueError("Expected a JSON object with an expression")
+
+        return body
+
+    def do_GET(self):
+        if self.path != "/stats":
+            self._send_json(404, {"error": "Not found"})
+            return
+
+        stats = self.server.stats.snapshot()
+        stats["cache"] = {"size": len(self.server.cache), "hits": self.server.cache.hits, "misses": self.server.cache.misses}
+
+        self._send_json(200, stats)
+
+    def do_POST(self):
+        endpoint = self.path
+        started = time.perf_counter()
+
+        try:
+            if endpoint == "/evaluate":
+                body = self._read_json()
+                results = self.server.evaluate(body["expression"], body.get("assignments", []))
+
+                response = {"results": results}
+                rows = len(results)
+            elif endpoint == "/evaluate_all":
+                body = self._read_json()
+                variables, table = self.server.evaluate_all(body["expression"], bool(body.get("sort_vars", False)))
+
+                response = {"variables": variables, "rows": table}
+                rows = len(table)
+            else:
+                self._send_json(404, {"error": "Not found"})
+                return
+        except TooLargeError as e:
+            self.server.stats.record_error(endpoint)
+            self._send_json(413, {"error": str(e)})
+            return
+        except (ValueError, KeyError, TypeError) as e:
+            # Bad JSON, bad expressions and missing variables
+            self.server.stats.record_error(endpoint)
+            self._send_json(400, {"error": str(e)})
+            return
+
+        self.server.stats.record(endpoint, time.perf_counter() - started, rows)
+        self._send_json(200, response)
+
+def serve(host : str = "127.0.0.1", port : int = 8080, workers : int = 0, cache_size : int = 1024, max_variables : int = DEFAULT_MAX_VARIABLES):
+    """Runs the evaluation server until it is interrupted"""
+
+    server = EvaluationServer((host, port), workers, cache_size, max_variables=max_variables)
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,34 @@
+# This file is used to find which variables can actually change the result of an expression.
+#
+# A variable is relevant if the two cofactors of the function (the function with the variable set to false,
+# and with it set to true) are different. Irrelevant variables (i.e. B in 'B' OR -'B' OR 'A') don't need to
+# be enumerated, as every one of them doubles the size of the truth table without changing the results.
+
+from .tokens import *
+from .bitwise import evaluate_bits, flip_rows, MAX_BITMASK_VARIABLES
+from .bdd import BDD
+
+def find_support(postfix_tokens : list, variables : list) -> list:
+    """Gets the variables that can change the result of the postfix tokens, in the same order as variables"""
+
+    num_variables = len(variables)
+
+    # Without a result nothing is relevant
+    if not postfix_tokens:
+        return []
+
+    if num_variables > MAX_BITMASK_VARIABLES:
+        # The BDD only has nodes for the variables the function depends on
+        bdd = BDD(variables)
+        levels = bdd.support(bdd.from_postfix(postfix_tokens))
+
+        return [var for i, var in enumerate(variables) if i in levels]
+
+    bits = evaluate_bits(postfix_tokens, variables)
+    relevant = []
+
+    for i, var in enumerate(variables):
+        if flip_rows(bits, i, num_variables):
+            relevant.append(var)
+
+    return relevant
@@ -0,0 +1,117 @@
+# This file is used to access truth tables without building them.
+
+from .evaluator import *
+from .bitwise import evaluate_bits, DEFAULT_BLOCK_SIZE
+
+from collections import OrderedDict
+
+class TruthTable:
+    """A lazy truth table, rows are worked out a block at a time when they are asked for
+
+    Rows are [variables dict, result] lists in the same order as evaluate_all gives them."""
+
+    def __init__(self, expressions : str, sort_vars : bool = False, block_size : int = DEFAULT_BLOCK_SIZE, cache_size : int = 16):
+        if block_size < 1 or block_size & (block_size - 1):
+            raise ValueError("Block size must be a power of two")
+
+        # Get the program
+        self.postfix_tokens, self.variables = parse(expressions, sort_vars)
+
+        self.num_rows = 2 ** len(self.variables)
+        self.block_size = min(block_size, self.num_rows)
+        self.cache_size = cache_size
+
+        self._blocks = OrderedDict() # The most recently used blocks (block index to bitmask)
+
+    def __len__(self):
+        return self.num_rows
+
+    def _block(self, index : int) -> int:
+        """Gets the bitmask of the results of a block"""
+
+        if index in self._blocks:
+            # Mark it as the most recently used
+            self._blocks.move_to_end(index)
+            return self._blocks[index]
+
+        bits = evaluate_bits(self.postfix_tokens, self.variables, index * self.block_size, self.block_size)
+
+        self._blocks[index] = bits
+
+        # Remove the least recently used blocks
+        while len(self._blocks) > self.cache_size:
+            self._blocks.popitem(last=False)
+
+        return bits
+
+    def _values(self, row : int) -> dict:
+        """Gets the variables with their values for a row"""
+
+        num_variables = len(self.variables)
+
+        return {var: (row >> (num_variables - 1 - i)) & 1 == 1 for i, var in enumerate(self.variables)}
+
+    def _index(self, index : int) -> int:
+        """Gets the row of an index, raising IndexError if it isn't in the table"""
+
+        # Handle negative indexes
+        if index < 0:
+            index += self.num_rows
+
+        if not 0 <= index < self.num_rows:
+            raise IndexError("Row out of range")
+
+        return index
+
+    def result(self, row : int) -> bool:
+        """Gets the result of a row (negative rows count from the end)"""
+
+        return self._result(self._index(row))
+
+    def _result(self, row : int) -> bool:
+        bits = self._block(row // self.block_size)
+
+        # There is no result
+        if bits is None:
+            return None
+
+        return (bits >> (row % self.block_size)) & 1 == 1
+
+    def _row(self, row : int) -> list:
+        return [self._values(row), self._result(row)]
+
+    def __getitem__(self, index):
+        # Slices give lists of rows
+        if isinstance(index, slice):
+            return [self._row(row) for row in range(*index.indices(self.num_rows))]
+
+        return self._row(self._index(index))
+
+    def __iter__(self):
+        for row in range(self.num_rows):
+            yield self._row(row)
+
+    def where(self, value : bool = True):
+        """Yields the rows whose result is value"""
+
+        full = (1 << self.block_size) - 1
+
+        for index in range(self.num_rows // self.block_size):
+            bits = self._block(index)
+
+            # There is no result, so nothing matches
+            if bits is None:
+                return
+
+            # Find the rows with the wanted result
+            if not value:
+                bits ^= full
+
+            # Go through the set bits, lowest first
+            while bits:
+                lowest = bits & -bits
+                bits ^= lowest
+
+                row = index * self.block_size + lowest.bit_length() - 1
+
+                yield [self._values(row), value]
@@ -0,0 +1,62 @@
+import unittest
+import asyncio
+
+from concurrent.futures import ThreadPoolExecutor
+
+from ..evaluator import evaluate_all
+from ..aio import *
+
+class TestAio(unittest.TestCase):
+    expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+    def test_evaluate_all(self):
+        """Builds the same table as evaluate_all"""
+
+        rows = asyncio.run(evaluate_all_async(self.expression, sort_vars=True, chunk_size=3))
+
+        self.assertEqual(rows, evaluate_all(self.expression, sort_vars=True))
+
+    def test_iter(self):
+        """Yields the same rows as evaluate_all"""
+
+        async def collect():
+            return [row async for row in aiter_truth_table(self.expression, sort_vars=True, chunk_size=5)]
+
+        self.assertEqual(asyncio.run(collect()), evaluate_all(self.expression, sort_vars=True))
+
+    def test_executor(self):
+        """Evaluates the chunks in the executor"""
+
+        async def run():
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                return await evaluate_all_async(self.expression, sort_vars=True, chunk_size=4, executor=executor)
+
+        self.assertEqual(asyncio.run(run()), evaluate_all(self.expression, sort_vars=True))
+
+    def test_yields_to_loop(self):
+        """Lets other tasks run between chunks"""
+
+        async def run():
+            ticks = []
+
+            async def ticker():
+                while True:
+                    ticks.append(len(ticks))
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(ticker())
+
+            # 16 rows in chunks of 2 gives the ticker 8 chances to run
+            await evaluate_all_async(self.expression, chunk_size=2)
+
+            task.cancel()
+
+            return len(ticks)
+
+        self.assertGreaterEqual(asyncio.run(run()), 7)
+
+    def test_invalid_chunk_size(self):
+        """Rejects chunks without any rows"""
+
+        with self.assertRaises(ValueError):
+            asyncio.run(evaluate_all_async(self.expression, chunk_size=0))
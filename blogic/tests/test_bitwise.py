@@ -0,0 +1,60 @@
+import unittest
+
+from ..evaluator import evaluate_all, parse
+from ..bitwise import *
+
+class TestVariableMask(unittest.TestCase):
+    def test_whole_table(self):
+        """The first variable is the most significant bit"""
+
+        self.assertEqual(variable_mask(0, 2), 0b1100)
+        self.assertEqual(variable_mask(1, 2), 0b1010)
+
+    def test_blocks(self):
+        """Slow variables are constant across a block"""
+
+        self.assertEqual(variable_mask(0, 3, 0, 4), 0b0000)
+        self.assertEqual(variable_mask(0, 3, 4, 4), 0b1111)
+        self.assertEqual(variable_mask(2, 3, 4, 4), 0b1010)
+
+    def test_unaligned(self):
+        """Rejects blocks that aren't aligned"""
+
+        with self.assertRaises(ValueError):
+            variable_mask(0, 3, 2, 4)
+
+class TestEvaluateBits(unittest.TestCase):
+    def test_matches_evaluate_all(self):
+        """Gets the same results as evaluate_all"""
+
+        for expression in ["""'A' AND "B" OR - ("C" XOR "D")""", "'A' IMP 'B'", "'A' IFF -'B'"]:
+            postfix_tokens, variables = parse(expression, sort_vars=True)
+            bits = evaluate_bits(postfix_tokens, variables)
+
+            expected = [result for _, result in evaluate_all(expression, sort_vars=True)]
+
+            self.assertEqual([(bits >> row) & 1 == 1 for row in range(len(expected))], expected)
+
+    def test_no_tokens(self):
+        """Returns None without tokens"""
+
+        self.assertIsNone(evaluate_bits([], []))
+
+class TestCompileShared(unittest.TestCase):
+    def test_shares_subterms(self):
+        """Only compiles common subterms once"""
+
+        postfix_lists = [parse(expression)[0] for expression in ["'A' AND 'B'", "('B' AND 'A') OR 'C'"]]
+        nodes, outputs = compile_shared(postfix_lists)
+
+        # A, B, A AND B, C, (A AND B) OR C
+        self.assertEqual(len(nodes), 5)
+        self.assertEqual(outputs, [2, 4])
+
+    def test_keeps_order_of_implication(self):
+        """Doesn't share implications with swapped arguments"""
+
+        postfix_lists = [parse(expression)[0] for expression in ["'A' IMP 'B'", "'B' IMP 'A'"]]
+        nodes, outputs = compile_shared(postfix_lists)
+
+        self.assertNotEqual(outputs[0], outputs[1])
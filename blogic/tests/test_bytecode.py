@@ -0,0 +1,94 @@
+import unittest
+
+from ..evaluator import evaluate_all, evaluate_postfix, parse
+from ..tokeniser import tokenise, shunt
+from ..bitwise import evaluate_bits
+from ..bdd import BDD
+from ..bytecode import *
+
+class TestCompilePostfix(unittest.TestCase):
+    def test_matches_evaluate_postfix(self):
+        """Gets the same results as evaluate_postfix"""
+
+        for expression in ["""'A' AND "B" OR - ("C" XOR "D")""", "'A' IMP -'B'", "'A' IFF ('B' OR 'C')", "-'A'"]:
+            postfix_tokens, variables = parse(expression, sort_vars=True)
+            program = compile_postfix(postfix_tokens, variables)
+
+            for values, result in evaluate_all(expression, sort_vars=True):
+                self.assertEqual(program.evaluate(values), evaluate_postfix(postfix_tokens, values))
+                self.assertEqual(program.run([values[var] for var in variables]), result)
+
+    def test_opcodes(self):
+        """Compiles to opcodes with variable indexes"""
+
+        program = compile_postfix(parse("'B' AND -'A'")[0], ["A", "B"])
+
+        self.assertEqual(list(program.opcodes), [LOAD, LOAD, NOT, AND])
+        self.assertEqual(list(program.operands), [1, 0, 0, 0])
+        self.assertEqual(program.stack_size, 2)
+
+    def test_first_use_order(self):
+        """Defaults to the order the variables are used in"""
+
+        self.assertEqual(compile_postfix(parse("'B' AND 'A' OR 'B'")[0]).variables, ("B", "A"))
+
+    def test_empty(self):
+        """Empty programs have no result"""
+
+        self.assertIsNone(compile_postfix([]).run([]))
+
+    def test_missing_operand(self):
+        """Raises about missing operands"""
+
+        with self.assertRaises(ValueError):
+            compile_postfix(parse("'A' AND")[0])
+
+class TestNary(unittest.TestCase):
+    expressions = [
+        "'A' AND 'B' AND 'C' AND 'D'",
+        "'A' OR 'B' OR -'C' OR ('D' AND 'A' AND -'B')",
+        "'A' XOR 'B' XOR 'C' XOR ('D' OR 'A' OR 'B')",
+        "('A' XOR 'B' XOR 'C') IFF ('A' AND 'B' AND 'C' AND 'D')"
+    ]
+
+    def test_every_evaluator(self):
+        """Every evaluator gets the same results from the flattened tokens"""
+
+        for expression in self.expressions:
+            postfix_tokens, variables = parse(expression, sort_vars=True)
+            binary_tokens = shunt(tokenise(expression))
+
+            program = compile_postfix(postfix_tokens, variables)
+            self.assertLess(len(program.opcodes), len(compile_postfix(binary_tokens, variables).opcodes))
+
+            bits = evaluate_bits(postfix_tokens, variables)
+
+            bdd = BDD(variables)
+            self.assertEqual(bdd.from_postfix(postfix_tokens), bdd.from_postfix(binary_tokens))
+
+            for row, (values, _) in enumerate(evaluate_all(expression, sort_vars=True)):
+                expected = evaluate_postfix(binary_tokens, values)
+
+                self.assertEqual(evaluate_postfix(postfix_tokens, values), expected)
+                self.assertEqual(program.evaluate(values), expected)
+                self.assertEqual((bits >> row) & 1 == 1, expected)
+
+    def test_truthiness(self):
+        """Values that aren't booleans are treated by their truthiness, just like the binary operators"""
+
+        assignments = [{"A": None, "B": True, "C": 1, "D": 2}, {"A": 2, "B": 0, "C": "", "D": "x"}, {"A": 2, "B": 2, "C": 2, "D": 2}]
+
+        for expression in ["'A' AND 'B' AND 'C'", "'A' OR 'B' OR 'C' OR 'D'"]:
+            postfix_tokens, variables = parse(expression, sort_vars=True)
+            binary_tokens = shunt(tokenise(expression))
+
+            program = compile_postfix(postfix_tokens, variables)
+
+            for values in assignments:
+                self.assertEqual(bool(program.evaluate(values)), bool(evaluate_postfix(binary_tokens, values)), (expression, values))
+
+        # Every truthy value counts towards the parity
+        program = compile_postfix(parse("'A' XOR 'B' XOR 'C'")[0])
+
+        self.assertIs(program.evaluate({"A": 2, "B": True, "C": None}), False)
+        self.assertIs(program.evaluate({"A": 2, "B": 0, "C": ""}), True)
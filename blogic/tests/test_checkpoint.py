@@ -0,0 +1,58 @@
+import unittest
+import os
+import tempfile
+
+from ..evaluator import evaluate_all
+from ..checkpoint import *
+
+class TestCheckpoint(unittest.TestCase):
+    expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+    def setUp(self):
+        self.temp = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.temp.name, "job")
+
+    def tearDown(self):
+        self.temp.cleanup()
+
+    def test_run(self):
+        """Gets the same table as evaluate_all"""
+
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=4), 4)
+        self.assertEqual(progress(self.directory), (4, 4))
+        self.assertEqual(list(iter_results(self.directory)), evaluate_all(self.expression, sort_vars=True))
+
+    def test_resume(self):
+        """Carries on from the finished shards"""
+
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=2, max_shards=3), 3)
+        self.assertEqual(progress(self.directory), (3, 8))
+
+        # Unfinished jobs can't be read
+        with self.assertRaises(ValueError):
+            list(iter_results(self.directory))
+
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=2), 5)
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=2), 0)
+        self.assertEqual(list(iter_results(self.directory)), evaluate_all(self.expression, sort_vars=True))
+
+    def test_workers(self):
+        """Workers split the shards between them"""
+
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=2, worker=0, num_workers=3), 3)
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=2, worker=2, num_workers=3), 2)
+        self.assertEqual(progress(self.directory), (5, 8))
+
+        self.assertEqual(run_shards(self.expression, self.directory, sort_vars=True, shard_size=2, worker=1, num_workers=3), 3)
+        self.assertEqual(list(iter_results(self.directory)), evaluate_all(self.expression, sort_vars=True))
+
+    def test_different_job(self):
+        """Refuses to mix jobs in one directory"""
+
+        run_shards(self.expression, self.directory, shard_size=4)
+
+        with self.assertRaises(ValueError):
+            run_shards("'A' OR 'B'", self.directory, shard_size=4)
+
+        with self.assertRaises(ValueError):
+            run_shards(self.expression, self.directory, shard_size=8)
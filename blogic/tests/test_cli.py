@@ -0,0 +1,81 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+
+from ..cli import main
+
+class TestCli(unittest.TestCase):
+    def run_cli(self, argv : list, stdin : str = "") -> tuple:
+        """Runs the tool, returns the exit code and the output"""
+
+        out = io.StringIO()
+        old_stdin = sys.stdin
+
+        try:
+            sys.stdin = io.StringIO(stdin)
+
+            with contextlib.redirect_stdout(out), contextlib.redirect_stderr(io.StringIO()):
+                code = main(argv)
+        finally:
+            sys.stdin = old_stdin
+
+        return code, out.getvalue()
+
+    def test_table(self):
+        """Writes the truth table as CSV"""
+
+        code, out = self.run_cli(["--sort-vars", "'B' AND 'A'"])
+
+        self.assertEqual(code, 0)
+        self.assertEqual(out, "A,B,result\n0,0,0\n0,1,0\n1,0,0\n1,1,1\n")
+
+    def test_tsv(self):
+        """Writes the truth table as TSV"""
+
+        code, out = self.run_cli(["--format", "tsv", "--", "-'A'"])
+
+        self.assertEqual(out, "A\tresult\n0\t1\n1\t0\n")
+
+    def test_stdin(self):
+        """Reads the expressions from stdin"""
+
+        code, out = self.run_cli(["-m", "count"], "'A' OR 'B'\n\n'A' AND 'B'\n")
+
+        self.assertEqual(out, "expression,models,rows\n'A' OR 'B',3,4\n'A' AND 'B',1,4\n")
+
+    def test_file(self):
+        """Reads the expressions from files"""
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "rules.txt")
+
+            with open(path, "w") as file:
+                file.write("'A' AND -'A'\n'A' IMP 'B'\n")
+
+            code, out = self.run_cli(["-m", "sat", "--format", "jsonl", "--sort-vars", "-f", path])
+
+        lines = [json.loads(line) for line in out.splitlines()]
+
+        self.assertEqual(lines[0], {"expression": "'A' AND -'A'", "satisfiable": False, "model": None})
+        self.assertEqual(lines[1], {"expression": "'A' IMP 'B'", "satisfiable": True, "model": {"A": False, "B": False}})
+
+    def test_workers(self):
+        """Gets the same table with several workers"""
+
+        expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+        _, single = self.run_cli(["--sort-vars", expression])
+        _, parallel = self.run_cli(["--sort-vars", "--workers", "2", "--chunk-size", "3", expression])
+
+        self.assertEqual(single, parallel)
+
+    def test_invalid_expression(self):
+        """Fails on invalid expressions"""
+
+        code, _ = self.run_cli(["'A' AND ("])
+
+        self.assertEqual(code, 1)
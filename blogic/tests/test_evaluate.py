@@ -344,4 +344,92 @@ class TestEvaluateAll(unittest.TestCase):
             [{'A': False, 'B': True},  False],
             [{'A': True,  'B': False}, False],
             [{'A': True,  'B': True},  True]
-        ])
\ No newline at end of file
+        ])
+
+class TestEvaluateAllMany(unittest.TestCase):
+    def test_matches_evaluate_all(self):
+        """Gets the same results as evaluate_all for each expression"""
+
+        expressions = ["'A' AND 'B'", "'B' AND 'A' OR 'C'", "-('C' XOR 'A')"]
+
+        rows = evaluate_all_many(expressions, sort_vars=True)
+        singles = [evaluate_all(expression, sort_vars=True) for expression in ["'A' AND 'B' AND ('C' OR -'C')", "'B' AND 'A' OR 'C'", "-('C' XOR 'A') AND ('B' OR -'B')"]]
+
+        self.assertEqual(len(rows), 8)
+
+        for i, (values, results) in enumerate(rows):
+            self.assertEqual(values, singles[0][i][0])
+            self.assertEqual(results, [single[i][1] for single in singles])
+
+    def test_many_blocks(self):
+        """Works across several blocks"""
+
+        names = ["V%02d" % i for i in range(13)]
+        expressions = [" XOR ".join("'%s'" % name for name in names), "'V00' AND 'V12'"]
+
+        rows = evaluate_all_many(expressions, sort_vars=True)
+
+        self.assertEqual(len(rows), 2 ** 13)
+
+        for values, results in rows[::97]:
+            self.assertEqual(results[0], sum(values.values()) % 2 == 1)
+            self.assertEqual(results[1], values["V00"] and values["V12"])
+
+    def test_no_result(self):
+        """Empty expressions have no result"""
+
+        self.assertEqual(evaluate_all_many(["()", "'A'"]), [
+            [{'A': False}, [None, False]],
+            [{'A': True},  [None, True]]
+        ])
+
+class TestEvaluateBatch(unittest.TestCase):
+    expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+    def setUp(self):
+        self.rows = evaluate_all(self.expression)
+        self.assignments = [values for values, _ in self.rows] * 10
+        self.expected = [result for _, result in self.rows] * 10
+
+    def test_serial(self):
+        """Works without an executor"""
+
+        self.assertEqual(evaluate_batch(compile_expression(self.expression), self.assignments), self.expected)
+
+    def test_expression(self):
+        """Compiles expressions"""
+
+        self.assertEqual(evaluate_batch(self.expression, self.assignments), self.expected)
+
+    def test_threads(self):
+        """Splits the batch between threads"""
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        program = compile_expression(self.expression)
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            self.assertEqual(evaluate_batch(program, self.assignments, executor, chunk_size=7), self.expected)
+            self.assertEqual(evaluate_batch(program, self.assignments, executor), self.expected)
+
+    def test_small_batch(self):
+        """Small batches don't use the executor"""
+
+        class Executor:
+            def submit(self, *args):
+                raise AssertionError("The executor shouldn't be used")
+
+        self.assertEqual(evaluate_batch(self.expression, self.assignments, Executor()), self.expected)
+
+    def test_bad_chunk_size(self):
+        """Rejects chunks without any assignments"""
+
+        for chunk_size in (0, -1):
+            with self.assertRaises(ValueError):
+                evaluate_batch(self.expression, self.assignments, chunk_size=chunk_size)
+
+    def test_missing_variable(self):
+        """Raises about missing variables"""
+
+        with self.assertRaises(KeyError):
+            evaluate_batch("'A' AND 'B'", [{'A': True}])
@@ -0,0 +1,74 @@
+import unittest
+import io
+
+from ..evaluator import evaluate_all
+from ..export import *
+
+class TestExportCsv(unittest.TestCase):
+    def test_simple(self):
+        """Writes the header and every row"""
+
+        file = io.StringIO()
+        written = export_csv("'A' AND 'B'", file, sort_vars=True)
+
+        self.assertEqual(written, 4)
+        self.assertEqual(file.getvalue(), "A,B,result\n0,0,0\n0,1,0\n1,0,0\n1,1,1\n")
+
+    def test_tsv(self):
+        """Uses tabs for TSV"""
+
+        file = io.StringIO()
+        export_tsv("'A' OR 'B'", file, sort_vars=True)
+
+        self.assertEqual(file.getvalue().splitlines()[0], "A\tB\tresult")
+        self.assertEqual(file.getvalue().splitlines()[1], "0\t0\t0")
+
+    def test_only_true(self):
+        """Only writes the true rows"""
+
+        file = io.StringIO()
+        written = export_csv("'A' XOR 'B'", file, sort_vars=True, only=True, chunk_size=1)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(file.getvalue(), "A,B,result\n0,1,1\n1,0,1\n")
+
+    def test_only_false(self):
+        """Only writes the false rows"""
+
+        file = io.StringIO()
+        written = export_csv("'A' XOR 'B'", file, sort_vars=True, only=False, chunk_size=3)
+
+        self.assertEqual(written, 2)
+        self.assertEqual(file.getvalue(), "A,B,result\n0,0,0\n1,1,0\n")
+
+class TestExportPacked(unittest.TestCase):
+    def test_round_trip(self):
+        """Reads back the same table that evaluate_all builds"""
+
+        expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+        file = io.BytesIO()
+        written = export_packed(expression, file, sort_vars=True, chunk_size=5)
+        file.seek(0)
+
+        self.assertEqual(written, 16)
+        self.assertEqual(list(read_packed(file)), evaluate_all(expression, sort_vars=True))
+
+    def test_only_true(self):
+        """Only writes the true rows"""
+
+        expression = "'A' AND ('B' OR 'C')"
+
+        file = io.BytesIO()
+        export_packed(expression, file, sort_vars=True, only=True, chunk_size=2)
+        file.seek(0)
+
+        expected = [row for row in evaluate_all(expression, sort_vars=True) if row[1]]
+
+        self.assertEqual(list(read_packed(file)), expected)
+
+    def test_invalid_file(self):
+        """Rejects files that aren't packed tables"""
+
+        with self.assertRaises(ValueError):
+            list(read_packed(io.BytesIO(b"nope")))
@@ -0,0 +1,83 @@
+import unittest
+
+from .. import fingerprint as fingerprint_module
+from ..fingerprint import fingerprint
+from ..bdd import BDD, FALSE, TRUE
+from ..evaluator import parse
+from ..tokens import Or
+
+class TestFingerprint(unittest.TestCase):
+    def assertSameFunction(self, a : str, b : str):
+        self.assertEqual(fingerprint(a), fingerprint(b))
+
+    def test_reordered(self):
+        """Ignores the order of the operands"""
+
+        self.assertSameFunction("'A' AND 'B' OR 'C'", "'C' OR ('B' AND 'A')")
+
+    def test_de_morgan(self):
+        """Matches De Morgan variants"""
+
+        self.assertSameFunction("-('A' AND 'B')", "-'A' OR -'B'")
+        self.assertSameFunction("'A' IMP 'B'", "-'A' OR 'B'")
+
+    def test_brackets(self):
+        """Ignores redundant brackets"""
+
+        self.assertSameFunction("(('A') XOR ('B'))", "'A' XOR 'B'")
+
+    def test_different_functions(self):
+        """Tells different functions apart"""
+
+        self.assertNotEqual(fingerprint("'A' AND 'B'"), fingerprint("'A' OR 'B'"))
+        self.assertNotEqual(fingerprint("'A' AND 'B'"), fingerprint("'A' AND 'C'"))
+        self.assertNotEqual(fingerprint("'A' AND -'A'"), fingerprint("'A' OR -'A'"))
+
+    def test_bdd(self):
+        """Uses the BDD for bigger expressions"""
+
+        old = fingerprint_module.MAX_BITMASK_VARIABLES
+
+        try:
+            fingerprint_module.MAX_BITMASK_VARIABLES = 1
+
+            self.assertSameFunction("-('A' AND 'B')", "-'B' OR -'A'")
+            self.assertSameFunction("'A' AND -'A' AND 'B'", "-'B' AND 'B' AND 'A'")
+            self.assertNotEqual(fingerprint("'A' AND -'A' AND 'B'"), fingerprint("'A' OR -'A' OR 'B'"))
+        finally:
+            fingerprint_module.MAX_BITMASK_VARIABLES = old
+
+class TestBDD(unittest.TestCase):
+    def test_canonical(self):
+        """Equivalent expressions give the same node"""
+
+        bdd = BDD(["A", "B", "C"])
+
+        u = bdd.from_postfix(parse("'A' AND ('B' OR 'C')")[0])
+        v = bdd.from_postfix(parse("('A' AND 'B') OR ('C' AND 'A')")[0])
+
+        self.assertEqual(u, v)
+
+    def test_terminals(self):
+        """Tautologies and contradictions are terminals"""
+
+        bdd = BDD(["A"])
+
+        self.assertEqual(bdd.from_postfix(parse("'A' OR -'A'")[0]), TRUE)
+        self.assertEqual(bdd.from_postfix(parse("'A' AND -'A'")[0]), FALSE)
+
+    def test_deep(self):
+        """Handles far more levels than the recursion limit"""
+
+        names = ["V%04d" % i for i in range(1100)]
+        expression = " AND ".join("'%s'" % name for name in names)
+
+        bdd = BDD(names)
+        u = bdd.from_postfix(parse(expression)[0])
+
+        self.assertEqual(bdd.count(u), 1)
+        self.assertEqual(bdd.count(bdd.negate(u)), 2 ** 1100 - 1)
+        self.assertEqual(bdd.count(bdd.restrict(u, 0, True)), 2)
+        self.assertEqual(bdd.quantify(u, set(range(1100)), Or()), TRUE)
+
+        self.assertEqual(fingerprint(expression), fingerprint(" AND ".join("'%s'" % name for name in reversed(names))))
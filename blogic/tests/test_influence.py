@@ -0,0 +1,65 @@
+import unittest
+
+from .. import influence as influence_module
+from ..evaluator import evaluate
+from ..influence import influence
+
+class TestInfluence(unittest.TestCase):
+    expressions = [
+        "'A' AND 'B'",
+        "'A' XOR 'B' XOR 'C'",
+        "('A' AND 'B') OR -'C' OR ('D' IMP 'A')",
+        "'A' OR -'A' OR 'B'"
+    ]
+
+    def brute_force(self, expression : str) -> dict:
+        """Toggles each variable of every assignment"""
+
+        variables = sorted(set(expression.replace("(", " ").replace(")", " ").split("'")[1::2]))
+        counts = {var: 0 for var in variables}
+
+        for row in range(2 ** len(variables)):
+            values = {var: (row >> i) & 1 == 1 for i, var in enumerate(variables)}
+            result = evaluate(expression, values)
+
+            for var in variables:
+                if evaluate(expression, dict(values, **{var: not values[var]})) != result:
+                    counts[var] += 1
+
+        return counts
+
+    def test_bitmask(self):
+        """Matches toggling every variable by hand"""
+
+        for expression in self.expressions:
+            self.assertEqual(influence(expression, sort_vars=True), self.brute_force(expression), expression)
+
+    def test_bdd(self):
+        """The BDD gets the same counts"""
+
+        old = influence_module.MAX_BITMASK_VARIABLES
+
+        try:
+            influence_module.MAX_BITMASK_VARIABLES = 0
+
+            for expression in self.expressions:
+                self.assertEqual(influence(expression, sort_vars=True), self.brute_force(expression), expression)
+        finally:
+            influence_module.MAX_BITMASK_VARIABLES = old
+
+    def test_many_variables(self):
+        """Works on bigger expressions"""
+
+        names = ["V%02d" % i for i in range(20)]
+        counts = influence(" XOR ".join("'%s'" % name for name in names))
+
+        # Every variable of a parity function always flips the result
+        self.assertEqual(set(counts.values()), {2 ** 20})
+
+    def test_deep(self):
+        """Handles far more variables than the recursion limit"""
+
+        counts = influence(" AND ".join("'V%04d'" % i for i in range(1100)))
+
+        # Each variable only matters when every other one is true
+        self.assertEqual(set(counts.values()), {2})
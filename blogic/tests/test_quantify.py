@@ -0,0 +1,65 @@
+import unittest
+import itertools
+
+from ..evaluator import evaluate
+from ..quantify import exists, forall
+
+class TestQuantify(unittest.TestCase):
+    expression = """('A' AND "B") OR -("C" XOR "D") OR ('A' IMP -'D')"""
+    variables = ["A", "B", "C", "D"]
+
+    def check(self, program, quantified : list, combine):
+        """Compares the program with enumerating the quantified variables"""
+
+        remaining = [var for var in self.variables if var not in quantified]
+
+        self.assertEqual(sorted(program.variables), remaining)
+
+        for values in itertools.product([False, True], repeat=len(remaining)):
+            assignment = dict(zip(remaining, values))
+
+            expected = combine(
+                evaluate(self.expression, dict(assignment, **dict(zip(quantified, extra))))
+                for extra in itertools.product([False, True], repeat=len(quantified))
+            )
+
+            self.assertEqual(program.evaluate(assignment), expected, assignment)
+
+    def test_exists(self):
+        """Is there a value that makes it true"""
+
+        for quantified in [["A"], ["D"], ["A", "C"], ["B", "C", "D"]]:
+            self.check(exists(self.expression, quantified), quantified, any)
+
+    def test_forall(self):
+        """Does every value make it true"""
+
+        for quantified in [["A"], ["D"], ["A", "C"], ["B", "C", "D"]]:
+            self.check(forall(self.expression, quantified), quantified, all)
+
+    def test_every_variable(self):
+        """Quantifying over every variable gives a constant"""
+
+        self.assertTrue(exists("'A' AND 'B'", ["A", "B"]).evaluate({}))
+        self.assertFalse(forall("'A' AND 'B'", ["A", "B"]).evaluate({}))
+
+    def test_unknown_variable(self):
+        """Rejects variables that aren't used"""
+
+        with self.assertRaises(ValueError):
+            exists("'A'", ["B"])
+
+    def test_shared_nodes(self):
+        """Nodes reached by several paths are only stored once"""
+
+        names = ["V%02d" % i for i in range(24)]
+        parity = " XOR ".join("'%s'" % name for name in names)
+
+        program = exists("(%s) AND 'X'" % parity, ["X"])
+
+        # Parity needs two nodes per variable (one for each parity so far)
+        self.assertLessEqual(len(program.indexes), 2 * len(names))
+
+        for ones in (0, 1, 7, 24):
+            assignment = {name: i < ones for i, name in enumerate(names)}
+            self.assertEqual(program.evaluate(assignment), ones % 2 == 1)
@@ -0,0 +1,86 @@
+import unittest
+
+from ..sampling import *
+
+class TestEstimateTrueFraction(unittest.TestCase):
+    def test_simple(self):
+        """Gets close to the real fraction"""
+
+        # 3/4 of the assignments are true
+        estimate = estimate_true_fraction("'A' OR 'B'", samples=20000, seed=1)
+
+        self.assertEqual(estimate.samples, 20000)
+        self.assertLess(estimate.low, 0.75)
+        self.assertGreater(estimate.high, 0.75)
+        self.assertAlmostEqual(estimate.fraction, 0.75, delta=0.02)
+
+    def test_many_variables(self):
+        """Works with more variables than could be enumerated"""
+
+        names = ["V%02d" % i for i in range(64)]
+
+        # Only true if the first 3 are true, or 1/8 of the time
+        expression = "'V00' AND 'V01' AND 'V02' AND (" + " OR ".join("'%s'" % name for name in names) + ")"
+
+        estimate = estimate_true_fraction(expression, margin=0.01, seed=2)
+
+        self.assertEqual(estimate.samples, samples_for(0.01))
+        self.assertLessEqual(estimate.high - estimate.low, 0.02)
+        self.assertAlmostEqual(estimate.fraction, 1 / 8, delta=0.02)
+
+    def test_stratified(self):
+        """Stratified variables are enumerated"""
+
+        # The result only depends on the stratified variable, so the estimate is exact
+        estimate = estimate_true_fraction("'A' AND ('B' OR -'B')", samples=1000, stratify=["A"], seed=3)
+
+        self.assertEqual(estimate.fraction, 0.5)
+        self.assertLess(estimate.low, 0.5)
+        self.assertGreater(estimate.high, 0.5)
+        self.assertLess(estimate.high - estimate.low, 0.02)
+
+    def test_small_strata(self):
+        """The interval still covers the real fraction when a few samples are all false"""
+
+        # 1/16 of the assignments are true
+        expression = "'A' AND ('X' AND 'Y' AND 'Z')"
+
+        estimate = estimate_true_fraction(expression, samples=20, stratify=["A"], seed=1)
+
+        self.assertLess(estimate.low, 0.0625)
+        self.assertGreater(estimate.high, 0.0625)
+
+        # Roughly 95% of the intervals should cover it
+        covered = 0
+
+        for seed in range(200):
+            estimate = estimate_true_fraction(expression, samples=20, stratify=["A"], seed=seed)
+            covered += estimate.low <= 0.0625 <= estimate.high
+
+        self.assertGreaterEqual(covered, 180)
+
+    def test_no_samples(self):
+        """Rejects taking no samples"""
+
+        for stratify in (None, ["A"]):
+            with self.assertRaises(ValueError):
+                estimate_true_fraction("'A'", samples=0, stratify=stratify)
+
+    def test_too_many_strata(self):
+        """Rejects more strata than samples"""
+
+        names = ["V%02d" % i for i in range(30)]
+
+        with self.assertRaises(ValueError):
+            estimate_true_fraction(" AND ".join("'%s'" % name for name in names), samples=100, stratify=names)
+
+    def test_unknown_stratify_variable(self):
+        """Rejects stratify variables that aren't used"""
+
+        with self.assertRaises(ValueError):
+            estimate_true_fraction("'A'", samples=10, stratify=["B"])
+
+    def test_samples_for(self):
+        """The usual 95% sample size for a 0.5% margin"""
+
+        self.assertEqual(samples_for(0.005, 0.95), 38415)
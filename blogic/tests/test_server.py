@@ -0,0 +1,120 @@
+import unittest
+import json
+import threading
+import urllib.error
+import urllib.request
+
+from ..evaluator import evaluate_all
+from ..server import *
+
+class ServerTestCase(unittest.TestCase):
+    workers = 0
+
+    def setUp(self):
+        # Port 0 picks any free port
+        self.server = EvaluationServer(("127.0.0.1", 0), workers=self.workers, chunk_size=4)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+        self.url = "http://127.0.0.1:%d" % self.server.server_address[1]
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.thread.join()
+
+    def request(self, path : str, body : dict = None):
+        data = None if body is None else json.dumps(body).encode("utf-8")
+
+        with urllib.request.urlopen(self.url + path, data) as response:
+            return json.loads(response.read().decode("utf-8"))
+
+class TestServer(ServerTestCase):
+    def test_evaluate(self):
+        """Evaluates every assignment"""
+
+        response = self.request("/evaluate", {
+            "expression": "'A' AND 'B'",
+            "assignments": [{"A": True, "B": True}, {"A": True, "B": False}]
+        })
+
+        self.assertEqual(response["results"], [True, False])
+
+    def test_evaluate_all(self):
+        """Builds the same table as evaluate_all"""
+
+        expression = "'A' AND ('B' OR 'C')"
+        response = self.request("/evaluate_all", {"expression": expression, "sort_vars": True})
+
+        self.assertEqual(response["variables"], ["A", "B", "C"])
+        self.assertEqual(response["rows"], evaluate_all(expression, sort_vars=True))
+
+    def test_cache(self):
+        """Reuses parsed expressions"""
+
+        for _ in range(3):
+            self.request("/evaluate", {"expression": "'A'", "assignments": [{"A": True}]})
+
+        stats = self.request("/stats")
+
+        self.assertEqual(stats["cache"], {"size": 1, "hits": 2, "misses": 1})
+        self.assertEqual(stats["endpoints"]["/evaluate"]["requests"], 3)
+        self.assertEqual(stats["rows"], 3)
+
+    def test_bad_request(self):
+        """Reports missing variables as bad requests"""
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request("/evaluate", {"expression": "'A'", "assignments": [{}]})
+
+        self.assertEqual(context.exception.code, 400)
+        self.assertEqual(self.request("/stats")["endpoints"]["/evaluate"]["errors"], 1)
+
+    def test_too_large(self):
+        """Rejects tables with too many variables"""
+
+        self.server.max_variables = 3
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request("/evaluate_all", {"expression": "'A' AND 'B' AND 'C' AND 'D'"})
+
+        self.assertEqual(context.exception.code, 413)
+        self.assertEqual(self.request("/stats")["endpoints"]["/evaluate_all"]["errors"], 1)
+
+        # Smaller tables are still fine
+        self.assertEqual(len(self.request("/evaluate_all", {"expression": "'A' AND 'B' AND 'C'"})["rows"]), 8)
+
+    def test_not_found(self):
+        """Unknown paths are not found"""
+
+        with self.assertRaises(urllib.error.HTTPError) as context:
+            self.request("/nope")
+
+        self.assertEqual(context.exception.code, 404)
+
+class TestServerWorkers(ServerTestCase):
+    workers = 2
+
+    def test_evaluate_all(self):
+        """Splits big tables between the workers"""
+
+        expression = """'A' AND "B" OR - ("C" XOR "D")"""
+        response = self.request("/evaluate_all", {"expression": expression, "sort_vars": True})
+
+        self.assertEqual(response["rows"], evaluate_all(expression, sort_vars=True))
+
+class TestExpressionCache(unittest.TestCase):
+    def test_evicts_least_recently_used(self):
+        """Drops the least recently used expression"""
+
+        cache = ExpressionCache(max_size=2)
+
+        cache.get("'A'")
+        cache.get("'B'")
+        cache.get("'A'")
+        cache.get("'C'")
+        cache.get("'B'")
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.misses, 4)
+        self.assertEqual(cache.hits, 1)
@@ -0,0 +1,73 @@
+import unittest
+import io
+
+from ..evaluator import evaluate, evaluate_postfix, parse, parse_stream
+from ..tokeniser import tokenise, tokenise_stream
+
+class TestTokeniseStream(unittest.TestCase):
+    expressions = [
+        "('Hello' AND 'World') OR \"World\"",
+        "('Hello'AND'World')OR\"World\"",
+        """'A' AND "B" OR - ("C" XOR "D")""",
+        "'I\\'m a string' IMP 'Hello\\\\World' IFF -'x'",
+        "'A'ANDOR"
+    ]
+
+    def test_matches_tokenise(self):
+        """Gets the same tokens as tokenise, whatever the chunk size"""
+
+        for expression in self.expressions:
+            expected = [str(token) for token in tokenise(expression)]
+
+            for chunk_size in range(1, 8):
+                tokens = tokenise_stream(io.StringIO(expression), chunk_size)
+
+                self.assertEqual([str(token) for token in tokens], expected)
+
+    def test_shares_variables(self):
+        """Uses the same token for every use of a variable"""
+
+        tokens = list(tokenise_stream(io.StringIO("'A' AND 'A' OR 'A'")))
+
+        self.assertIs(tokens[0], tokens[2])
+        self.assertIs(tokens[0], tokens[4])
+
+    def test_unclosed_string(self):
+        """Raises about unclosed strings"""
+
+        with self.assertRaises(ValueError):
+            list(tokenise_stream(io.StringIO("'A' AND 'B"), 3))
+
+    def test_invalid_token(self):
+        """Raises about invalid tokens"""
+
+        with self.assertRaises(ValueError):
+            list(tokenise_stream(io.StringIO("'life' is 'funny'")))
+
+        with self.assertRaises(ValueError):
+            list(tokenise_stream(io.StringIO("'A' & 'B'")))
+
+class TestParseStream(unittest.TestCase):
+    def test_matches_parse(self):
+        """Gets the same program as parse"""
+
+        expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+        postfix_tokens, variables = parse_stream(io.StringIO(expression), sort_vars=True, chunk_size=4)
+        expected_tokens, expected_variables = parse(expression, sort_vars=True)
+
+        self.assertEqual([str(token) for token in postfix_tokens], [str(token) for token in expected_tokens])
+        self.assertEqual(variables, expected_variables)
+
+    def test_deeply_nested(self):
+        """Handles very deep nesting"""
+
+        depth = 10 ** 4
+        expression = "('A' AND " * depth + "'B'" + ")" * depth
+
+        postfix_tokens, variables = parse_stream(io.StringIO(expression), chunk_size=1000)
+
+        self.assertEqual(variables, ["A", "B"])
+        self.assertTrue(evaluate_postfix(postfix_tokens, {"A": True, "B": True}))
+        self.assertFalse(evaluate_postfix(postfix_tokens, {"A": True, "B": False}))
+        self.assertEqual(evaluate_postfix(postfix_tokens, {"A": True, "B": True}), evaluate(expression, {"A": True, "B": True}))
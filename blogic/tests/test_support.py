@@ -0,0 +1,71 @@
+import unittest
+
+from .. import support as support_module
+from ..evaluator import evaluate_all, expand_truth_table, parse
+from ..support import find_support
+
+class TestFindSupport(unittest.TestCase):
+    expressions = {
+        "'A' OR -'A' OR 'B'": [],
+        "('A' OR -'A') AND 'B'": ["B"],
+        "'A' AND 'B' OR 'C'": ["A", "B", "C"],
+        "('A' XOR 'A') OR ('B' AND 'C')": ["B", "C"],
+        "'A' IMP ('B' IMP 'A')": []
+    }
+
+    def test_bitmask(self):
+        """Finds the relevant variables from the truth table"""
+
+        for expression, expected in self.expressions.items():
+            self.assertEqual(find_support(*parse(expression, sort_vars=True)), expected, expression)
+
+    def test_bdd(self):
+        """Finds the relevant variables from the BDD"""
+
+        old = support_module.MAX_BITMASK_VARIABLES
+
+        try:
+            support_module.MAX_BITMASK_VARIABLES = 0
+
+            for expression, expected in self.expressions.items():
+                self.assertEqual(find_support(*parse(expression, sort_vars=True)), expected, expression)
+        finally:
+            support_module.MAX_BITMASK_VARIABLES = old
+
+class TestReduceSupport(unittest.TestCase):
+    def test_reduced_table(self):
+        """Only enumerates the relevant variables"""
+
+        rows = evaluate_all("('A' OR -'A') AND ('B' XOR 'C') OR ('D' AND -'D')", sort_vars=True, reduce_support=True)
+
+        self.assertEqual(rows, [
+            [{'B': False, 'C': False}, False],
+            [{'B': False, 'C': True},  True],
+            [{'B': True,  'C': False}, True],
+            [{'B': True,  'C': True},  False]
+        ])
+
+    def test_expand(self):
+        """Expands back to the full table"""
+
+        expression = "('A' OR -'A') AND ('B' XOR 'C') OR ('D' AND -'D')"
+        variables = parse(expression, sort_vars=True)[1]
+
+        reduced = evaluate_all(expression, sort_vars=True, reduce_support=True)
+
+        self.assertEqual(list(expand_truth_table(reduced, variables)), evaluate_all(expression, sort_vars=True))
+
+    def test_constant(self):
+        """Constants have a single row"""
+
+        rows = evaluate_all("'A' OR -'A'", reduce_support=True)
+
+        self.assertEqual(rows, [[{}, True]])
+        self.assertEqual(list(expand_truth_table(rows, ["A"])), [[{'A': False}, True], [{'A': True}, True]])
+
+    def test_many_variables(self):
+        """Handles far more variables than the recursion limit"""
+
+        chain = " AND ".join("'V%04d'" % i for i in range(1100))
+
+        self.assertEqual(evaluate_all("(%s) AND -'V0000'" % chain, reduce_support=True), [[{}, False]])
@@ -0,0 +1,82 @@
+import unittest
+
+from ..evaluator import evaluate_all
+from ..table import TruthTable
+
+class TestTruthTable(unittest.TestCase):
+    expression = """'A' AND "B" OR - ("C" XOR "D")"""
+
+    def setUp(self):
+        self.rows = evaluate_all(self.expression, sort_vars=True)
+        self.table = TruthTable(self.expression, sort_vars=True, block_size=4, cache_size=2)
+
+    def test_len(self):
+        """Has a row for every assignment"""
+
+        self.assertEqual(len(self.table), 16)
+
+    def test_index(self):
+        """Gets the same rows as evaluate_all"""
+
+        for i in range(16):
+            self.assertEqual(self.table[i], self.rows[i])
+
+        self.assertEqual(self.table[-1], self.rows[-1])
+
+        with self.assertRaises(IndexError):
+            self.table[16]
+
+    def test_result(self):
+        """Gets the results of rows, checking they are in the table"""
+
+        self.assertEqual(self.table.result(3), self.rows[3][1])
+        self.assertEqual(self.table.result(-1), self.rows[-1][1])
+
+        for row in (16, 100, -17):
+            with self.assertRaises(IndexError):
+                self.table.result(row)
+
+    def test_slice(self):
+        """Slices like a list"""
+
+        self.assertEqual(self.table[3:11], self.rows[3:11])
+        self.assertEqual(self.table[::-3], self.rows[::-3])
+        self.assertEqual(list(self.table), self.rows)
+
+    def test_where(self):
+        """Only yields the rows with the result"""
+
+        self.assertEqual(list(self.table.where(True)), [row for row in self.rows if row[1]])
+        self.assertEqual(list(self.table.where(False)), [row for row in self.rows if not row[1]])
+
+    def test_cache(self):
+        """Only keeps a few blocks"""
+
+        self.table[0]
+        self.table[5]
+        self.table[10]
+
+        self.assertEqual(list(self.table._blocks), [1, 2])
+
+    def test_big_table(self):
+        """Gets rows of big tables without building them"""
+
+        names = ["V%02d" % i for i in range(30)]
+        table = TruthTable(" XOR ".join("'%s'" % name for name in names), sort_vars=True)
+
+        row = 2 ** 29 + 17
+
+        self.assertEqual(len(table), 2 ** 30)
+        self.assertEqual(table[row][1], bin(row).count("1") % 2 == 1)
+        self.assertEqual(table[row][0]["V00"], True)
+        self.assertEqual(table[row][0]["V01"], False)
+        self.assertEqual(table[row][0]["V29"], True)
+        self.assertEqual(len(table[row:row + 1000]), 1000)
+
+    def test_no_result(self):
+        """Empty expressions have no result"""
+
+        table = TruthTable("()")
+
+        self.assertEqual(table[0], [{}, None])
+        self.assertEqual(list(table.where(True)), [])
@@ -1,6 +1,6 @@
 import unittest
 
-from ..tokeniser import capture_strings, tokenise, shunt, And, Or, Xor, Not
+from ..tokeniser import capture_strings, tokenise, shunt, flatten, And, Or, Xor, Not, Nary
 
 class TestCaptureStrings(unittest.TestCase):
     def test_extracts_strings(self):
@@ -179,6 +179,47 @@ class TestShunt(unittest.TestCase):
 
         self.assertEqual([str(i) for i in output], ['A', 'B', 'C', 'OR', 'AND'])
 
+class TestFlatten(unittest.TestCase):
+    def flat(self, expression):
+        return [str(i) + (str(i.count) if isinstance(i, Nary) else "") for i in flatten(shunt(tokenise(expression)))]
+
+    def test_chain(self):
+        """Flattens chains of the same operator"""
+
+        self.assertEqual(self.flat("'A' AND 'B' AND 'C' AND 'D'"), ['A', 'B', 'C', 'D', 'AND4'])
+
+    def test_nested_chain(self):
+        """Flattens chains split by brackets"""
+
+        self.assertEqual(self.flat("'A' OR ('B' OR ('C' OR 'D')) OR 'E'"), ['A', 'B', 'C', 'D', 'E', 'OR5'])
+        self.assertEqual(self.flat("('A' XOR 'B') XOR ('C' XOR 'D')"), ['A', 'B', 'C', 'D', 'XOR4'])
+
+    def test_mixed(self):
+        """Only merges the same operator"""
+
+        self.assertEqual(self.flat("'A' AND 'B' AND 'C' OR 'D'"), ['A', 'B', 'C', 'AND3', 'D', 'OR'])
+        self.assertEqual(self.flat("-('A' AND 'B') AND 'C'"), ['A', 'B', 'AND', '-', 'C', 'AND'])
+        self.assertEqual(self.flat("'A' IMP 'B' IMP 'C'"), ['A', 'B', 'IMP', 'C', 'IMP'])
+
+    def test_pairs(self):
+        """Leaves single operators alone"""
+
+        self.assertEqual(self.flat("'A' AND 'B'"), ['A', 'B', 'AND'])
+
+    def test_deep(self):
+        """Handles very deep chains"""
+
+        depth = 10 ** 4
+        expression = "('A' AND " * depth + "'B'" + ")" * depth
+
+        self.assertEqual(self.flat(expression)[-1], 'AND%d' % (depth + 1))
+
+    def test_missing_operand(self):
+        """Raises about missing operands"""
+
+        with self.assertRaises(ValueError):
+            flatten(shunt(tokenise("'A' AND")))
+
 class TestOperators(unittest.TestCase):
     def test_and(self):
         """AND works"""
@@ -217,4 +217,168 @@ def shunt(tokens : list) -> list:
         output.append(stack.pop())
     
     # Return the output
-    return output
\ No newline at end of file
+    return output
+
+# Matches a single token (or whitespace) for tokenise_stream, strings include their quotes
+STREAM_TOKEN_RE = re.compile(
+    r"""(?P<space>\s+)"""
+    r"""|(?P<bracket>[\(\)])"""
+    r"""|(?P<not>""" + re.escape(Not.symbol) + r""")"""
+    r"""|(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")"""
+    r"""|(?P<word>[a-zA-Z0-9_]+)""",
+    re.DOTALL
+)
+
+# Matches a word made only of operators (i.e. AND or ANDOR, just like tokenise)
+OPERATORS_RE = re.compile("(" + "|".join(OPERATORS) + ")")
+
+def tokenise_stream(stream, chunk_size : int = 2 ** 16):
+    """Tokenises an expression read from a text stream a chunk at a time, yielding the tokens as they are found
+
+    Unlike tokenise, the whole expression is never held in memory, so the tokens can go straight into shunt.
+    Operators and variables with the same name share a single token instance."""
+
+    if chunk_size < 1:
+        raise ValueError("Chunk size must be positive")
+
+    # Tokens hold no state, so they can be shared (this keeps the postfix output small)
+    operators = {symbol: op() for symbol, op in OPERATORS.items()}
+    brackets = {val: Bracket(val) for val in BRACKETS}
+    negate = Not()
+    variables = {}
+
+    buffer = "" # The part of the stream that hasn't been tokenised yet
+    eof = False
+
+    while not eof:
+        chunk = stream.read(chunk_size)
+
+        eof = not chunk
+        buffer += chunk
+
+        pos = 0
+
+        while pos < len(buffer):
+            match = STREAM_TOKEN_RE.match(buffer, pos)
+
+            if match is None:
+                # An unclosed string might be closed in the next chunk
+                if not eof and buffer[pos] in STRING_OPENERS:
+                    break
+
+                if buffer[pos] in STRING_OPENERS:
+                    raise ValueError("Unclosed string")
+
+                raise ValueError("Invalid token: " + buffer[pos])
+
+            # The token might carry on into the next chunk
+            if match.end() == len(buffer) and not eof:
+                break
+
+            pos = match.end()
+            kind = match.lastgroup
+
+            if kind == "space":
+                continue
+
+            if kind == "bracket":
+                yield brackets[match.group()]
+                continue
+
+            if kind == "not":
+                yield negate
+                continue
+
+            if kind == "string":
+                # Remove the quotes and the escapes
+                name = re.sub(r"\\(.)", r"\1", match.group()[1:-1], flags=re.DOTALL)
+
+                # Share the variable between every use of the name
+                if name not in variables:
+                    variables[name] = Variable(name)
+
+                yield variables[name]
+                continue
+
+            # Words must be made of operators
+            word = match.group()
+
+            if OPERATORS_RE.sub("", word):
+                raise ValueError("Invalid token: " + word)
+
+            for symbol in OPERATORS_RE.findall(word):
+                yield operators[symbol]
+
+        # Keep the unfinished part for the next chunk
+        buffer = buffer[pos:]
+
+def flatten(postfix_tokens : list) -> list:
+    """Flattens chains of the same associative operator in shunted tokens into single Nary tokens
+
+    For example 'A' AND 'B' AND 'C' shunts into A B AND C AND, which becomes A B C AND(3). This way the
+    evaluators pop, perform and push once per chain rather than once per operator."""
+
+    output = []
+
+    # Each value on the stack is None, or a (token, count, slot) chain that may still grow. The operator of a
+    # chain isn't known until it ends, so slot is the index of a placeholder for it in the output.
+    stack = []
+
+    def finish(value):
+        if value is not None:
+            token, count, slot = value
+
+            # Chains of more than two values become a single Nary token
+            output[slot] = Nary(token, count) if count > 2 else token
+
+    for token in postfix_tokens:
+        if isinstance(token, Variable):
+            output.append(token)
+            stack.append(None)
+            continue
+
+        # Make sure the operator has its operands
+        if isinstance(token, Operator) and len(stack) < (1 if isinstance(token, Not) else 2):
+            raise ValueError("Missing operand for " + str(token))
+
+        if isinstance(token, Not):
+            finish(stack.pop())
+
+            output.append(token)
+            stack.append(None)
+            continue
+
+        if isinstance(token, ASSOCIATIVE):
+            b = stack.pop()
+            a = stack.pop()
+
+            count = 0
+
+            for value in (a, b):
+                if value is not None and type(value[0]) is type(token):
+                    # Carry on the chain of the argument (its operator is replaced by this one)
+                    output[value[2]] = None
+                    count += value[1]
+                else:
+                    finish(value)
+                    count += 1
+
+            output.append(None)
+            stack.append((token, count, len(output) - 1))
+            continue
+
+        if isinstance(token, Operator):
+            finish(stack.pop())
+            finish(stack.pop())
+
+            output.append(token)
+            stack.append(None)
+            continue
+
+        raise ValueError("Invalid token: " + str(token))
+
+    for value in stack:
+        finish(value)
+
+    # Drop the placeholders of the operators that were merged into chains
+    return [token for token in output if token is not None]
@@ -32,6 +32,11 @@ class Operator(Token):
     def perform(self, a : bool, b : bool) -> bool:
         raise NotImplementedError()
 
+    def perform_bits(self, a : int, b : int, mask : int) -> int:
+        """Performs the operator on every bit of a and b at once (mask has a bit set for every row)"""
+
+        raise NotImplementedError()
+
 class And(Operator):
     """Represents the AND operator"""
 
@@ -43,6 +48,19 @@ class And(Operator):
     def perform(self, a: bool, b: bool) -> bool:
         return a and b
 
+    def perform_bits(self, a: int, b: int, mask: int) -> int:
+        return a & b
+
+    def perform_many(self, values: list) -> bool:
+        # Stops at the first false value
+        return all(values)
+
+    def perform_many_bits(self, values: list, mask: int) -> int:
+        result = mask
+        for val in values:
+            result &= val
+        return result
+
 class Or(Operator):
     """Represents the OR operator"""
 
@@ -54,6 +72,19 @@ class Or(Operator):
     def perform(self, a: bool, b: bool) -> bool:
         return a or b
 
+    def perform_bits(self, a: int, b: int, mask: int) -> int:
+        return a | b
+
+    def perform_many(self, values: list) -> bool:
+        # Stops at the first true value
+        return any(values)
+
+    def perform_many_bits(self, values: list, mask: int) -> int:
+        result = 0
+        for val in values:
+            result |= val
+        return result
+
 class Xor(Operator):
     """Represents the "exclusive or" operator"""
 
@@ -65,6 +96,19 @@ class Xor(Operator):
     def perform(self, a: bool, b: bool) -> bool:
         return a ^ b
 
+    def perform_bits(self, a: int, b: int, mask: int) -> int:
+        return a ^ b
+
+    def perform_many(self, values: list) -> bool:
+        # True if there are an odd number of true values
+        return sum(map(bool, values)) % 2 == 1
+
+    def perform_many_bits(self, values: list, mask: int) -> int:
+        result = 0
+        for val in values:
+            result ^= val
+        return result
+
 class Not(Operator):
     """Represents a NOT prefix operator"""
 
@@ -81,6 +125,9 @@ class Not(Operator):
     def perform(self, a: bool) -> bool:
         return not a
 
+    def perform_bits(self, a: int, mask: int) -> int:
+        return a ^ mask
+
 class IfAndOnlyIf(Operator):
     """Represents the "if and only if" operator"""
 
@@ -92,6 +139,9 @@ class IfAndOnlyIf(Operator):
     def perform(self, a: bool, b: bool) -> bool:
         return a == b
 
+    def perform_bits(self, a: int, b: int, mask: int) -> int:
+        return (a ^ b) ^ mask
+
 class Implies(Operator):
     """Represents an implies/entails operator"""
 
@@ -103,6 +153,26 @@ class Implies(Operator):
     def perform(self, a: bool, b: bool) -> bool:
         return not a or b
 
+    def perform_bits(self, a: int, b: int, mask: int) -> int:
+        return (a ^ mask) | b
+
+class Nary(Token):
+    """Represents an associative operator (AND, OR or XOR) performed on more than two values at once
+
+    These are never made by the tokeniser, they replace chains of the same operator (see flatten)."""
+
+    def __init__(self, operator : Operator, count : int):
+        super().__init__(operator.symbol)
+
+        self.operator = operator
+        self.count = count
+
+    def perform(self, values : list) -> bool:
+        return self.operator.perform_many(values)
+
+    def perform_bits(self, values : list, mask : int) -> int:
+        return self.operator.perform_many_bits(values, mask)
+
 class Variable(Token):
     """Represents a variable and stores its value"""
 
@@ -122,6 +192,9 @@ OPERATORS = {
     Implies.symbol: Implies
 }
 
+# Define the operators that can be flattened into a single Nary token
+ASSOCIATIVE = (And, Or, Xor)
+
 # Define what brackets we support
 BRACKETS = ["(", ")"]
 
@@ -7,5 +7,10 @@ setup(
     author='HowITsDone',
     author_email='32576907+gingerchicken@users.noreply.github.com',
     packages=['blogic'],
-    install_requires=[]
+    install_requires=[],
+    entry_points={
+        'console_scripts': [
+            'blogic=blogic.cli:main'
+        ]
+    }
 )
\ No newline at end of file